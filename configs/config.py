@@ -31,10 +31,23 @@ class Settings(BaseSettings):
     POSTGRES_PORT: int = Field(5432, env="POSTGRES_PORT")
     POSTGRES_DB: str = Field("webcrawldb", env="POSTGRES_DB")
 
+    # PostgreSQL connection pool (per worker)
+    PG_POOL_MIN_SIZE: int = Field(2, env="PG_POOL_MIN_SIZE")
+    PG_POOL_MAX_SIZE: int = Field(10, env="PG_POOL_MAX_SIZE")
+    PG_POOL_ACQUIRE_TIMEOUT: float = Field(2.0, env="PG_POOL_ACQUIRE_TIMEOUT")
+    PG_COMMAND_TIMEOUT: float = Field(5.0, env="PG_COMMAND_TIMEOUT")
+    PG_CONNECT_TIMEOUT: float = Field(5.0, env="PG_CONNECT_TIMEOUT")
+    PG_MAX_INACTIVE_CONNECTION_LIFETIME: float = Field(300.0, env="PG_MAX_INACTIVE_CONNECTION_LIFETIME")
+    PG_STATEMENT_CACHE_SIZE: int = Field(100, env="PG_STATEMENT_CACHE_SIZE")
+
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNCPG_DSN(self) -> str: # asyncpg 직접 사용 시 (SQLAlchemy dialect 접두어 없음)
+        return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
     @property
     def SYNC_DATABASE_URL(self) -> str: # SQLAlchemy의 동기 엔진용 (테이블 생성 등)
         return f"postgresql+psycopg2://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
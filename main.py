@@ -21,12 +21,13 @@ from src.models.model_list import get_llm_info
 from src.utils.common import is_url, extract_urls, load_yaml, json_line
 from src.utils.logging import configure_logging
 from rich.console import Console
-from src.search.engines import load_search_engine
-from src.search.crawl import Crawler
+from src.search.engines import load_search_engine, load_search_cache
+from src.search.crawl import Crawler, CrawlBudget, CRAWL_META_KEY, strip_crawl_meta
+from src.search.context_packer import ContextPacker
 from configs.config import Settings
 from src.types.language import Language
-from src.search.browser_utils import load_browser_client
-from src.db.pg_utils import create_pg_tables, save_document_to_pg
+from src.search.browser_utils import browser_pool
+from src.db.pg_utils import create_pg_tables, save_documents_to_pg_bulk, init_pg_pool, close_pg_pool, purge_expired_search_results_in_pg
 asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 load_dotenv()
 
@@ -38,6 +39,7 @@ console = Console()
 
 prompts = load_yaml(os.path.join(os.path.dirname(__file__), "src", "prompts", "prompts.yaml"))
 config = load_yaml(os.path.join(os.path.dirname(__file__), "configs", "config.yaml"))
+extractor_rules = load_yaml(os.path.join(os.path.dirname(__file__), "configs", "extractors.yaml"))
 
 LOG_DIR = os.getenv("LOG_DIR")
 if not os.path.exists(LOG_DIR):
@@ -59,8 +61,68 @@ logger = structlog.get_logger()
 query_rewriter = QueryRewriter(model=QUERY_REWRITE_MODEL_NAME, max_tokens=config['models']['query_generator']['max_tokens'])
 outline_generator = OutlineGenerator(model=OUTLINE_GENERATOR_MODEL_NAME, max_tokens=config['models']['outline_generator']['max_tokens'])
 answer_generator = AnswerGenerator(model=ANSWER_GENERATOR_MODEL_NAME, max_tokens=config['models']['answer_generator']['max_tokens'])
-
-crawler = Crawler(news_list=config['domain_crawler']['news'], blog_list=config['domain_crawler']['blog'], media_list=config['domain_crawler']['media'], use_db_content=config['db']['use_db_content'], max_content_length=20000)
+context_packing_config = config['answer'].get('context_packing', {})
+context_packer = ContextPacker(model=ANSWER_GENERATOR_MODEL_NAME,
+                               max_context_tokens=context_packing_config.get('max_context_tokens', 24000),
+                               reserve_tokens=context_packing_config.get('reserve_tokens', 4000),
+                               output_tokens=config['models']['answer_generator']['max_tokens'],
+                               chunk_chars=context_packing_config.get('chunk_chars', 800)) if context_packing_config.get('enabled', False) else None
+
+crawler = Crawler(news_list=config['domain_crawler']['news'],
+                  blog_list=config['domain_crawler']['blog'],
+                  media_list=config['domain_crawler']['media'],
+                  use_db_content=config['db']['use_db_content'],
+                  max_content_length=config['crawler']['max_content_length'],
+                  max_content_tokens=config['crawler'].get('max_content_tokens'),
+                  tokenizer_model=ANSWER_GENERATOR_MODEL_NAME,
+                  html_conversion=config['crawler'].get('html_conversion'),
+                  pdf_extraction=config['crawler'].get('pdf_extraction'),
+                  media_options=config['crawler'].get('media_extractors'),
+                  render_service=config['crawler'].get('render_service'),
+                  extractor_rules=extractor_rules,
+                  extractor_substring_fallback=config['crawler'].get('extractor_substring_fallback', False),
+                  cache_ttl=config['db'].get('cache_ttl'),
+                  memory_cache_bytes=config['crawler']['memory_cache']['max_bytes'],
+                  memory_cache_ttl=config['crawler']['memory_cache']['ttl'],
+                  single_flight=config['crawler'].get('single_flight'))
+
+search_cache = load_search_cache(config['web_search'].get('cache'))
+USE_PG_SEARCH_CACHE = search_cache is not None and config['web_search']['cache'].get('backend') == "postgres"
+
+# Fire-and-forget work (e.g. DB writes) that must not delay the SSE stream.
+# Strong references keep the tasks alive until they finish; drained on shutdown.
+background_tasks: set[asyncio.Task] = set()
+
+
+def spawn_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+async def persist_web_contents(web_contents) -> None:
+    """Bulk-save crawled sources (a list, or the future of a crawl still running)."""
+    if asyncio.isfuture(web_contents):
+        web_contents = await web_contents
+    db_payloads = []
+    for web_content in web_contents:
+        crawl_meta = web_content.get(CRAWL_META_KEY, {})
+        if crawl_meta.get("from_cache"):
+            # served from a fresh/revalidated row; re-saving would extend its TTL unchecked
+            continue
+        db_payload = {
+            "url": web_content.get("url"),
+            "title": web_content.get("title"),
+            "snippet": web_content.get("snippet"),
+            "content": web_content.get("content"),
+            "date": web_content.get("date"),
+            "language": web_content.get("language"),
+            "type": web_content.get("type"),
+            "etag": crawl_meta.get("etag"),
+            "last_modified": crawl_meta.get("last_modified"),
+        }
+        db_payloads.append({k: v for k, v in db_payload.items() if v is not None})
+    await save_documents_to_pg_bulk(db_payloads)
 
 # --------------------------------------------------------------------------------
 # FastAPI application & lifespan events
@@ -72,9 +134,29 @@ async def lifespan(app: FastAPI):
     # TODO: Alembic (migration)
 
     # Create (or reuse) PostgreSQL tables if use_db_content is True
-    if config['db']['use_db_content']:
+    if config['db']['use_db_content'] or USE_PG_SEARCH_CACHE:
         create_pg_tables()
+
+    # App-scoped asyncpg pool (one per worker) for crawl cache lookups / saves
+    if config['db']['use_db_content'] or config['db']['save_content_to_db'] or USE_PG_SEARCH_CACHE:
+        await init_pg_pool()
+    if USE_PG_SEARCH_CACHE:
+        await purge_expired_search_results_in_pg()
+
+    # Long-lived HTTP/2 client shared by every request of this worker
+    browser_pool.start(**config['browser_client'])
+    # warm HTML conversion workers before the first request
+    crawler.html_engine.start()
+    crawler.pdf_engine.start()
     yield
+    if background_tasks:
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+    crawler.html_engine.shutdown()
+    crawler.pdf_engine.shutdown()
+    if crawler.render_service is not None:
+        await crawler.render_service.shutdown()
+    await browser_pool.aclose()
+    await close_pg_pool()
 
 
 app = FastAPI(title="Web Search API", version="0.1.0", lifespan=lifespan)
@@ -109,6 +191,13 @@ class Query(BaseModel):
     stream: bool = False
     use_youtube_transcript: bool = False
     top_k: int | str = "auto"
+    # crawl budget overrides (defaults: crawler.budget in config.yaml)
+    crawl_deadline_ms: int | None = None
+    crawl_quorum_sources: int | None = None
+    crawl_quorum_min_chars: int | None = None
+    # answer from search snippets first, then (optionally) refine with crawled pages
+    fast_first_token: bool = False
+    refine_answer: bool | None = None
 
     @field_validator("top_k", mode="before")
     def validate_top_k(cls, v):
@@ -129,6 +218,22 @@ def health_check():
     return {"status": "ok", "message": "Service is healthy"}
 
 
+@app.get("/stats")
+def stats():
+    # per-worker counters
+    return {
+        "pid": os.getpid(),
+        "browser_pool": browser_pool.stats.as_dict(),
+        "crawl_memory_cache": crawler.memory_cache.stats() if crawler.memory_cache is not None else None,
+        "crawl_single_flight": crawler.single_flight_stats(),
+        "html_engine": crawler.html_engine.stats(),
+        "pdf_engine": crawler.pdf_engine.stats(),
+        "render_service": crawler.render_service.stats() if crawler.render_service is not None else None,
+        "media_extractors": crawler.media_stats(),
+        "search_cache": search_cache.stats() if search_cache is not None else None,
+    }
+
+
 @app.post("/websearch", response_class=StreamingResponse)
 async def websearch(payload: Query, request: Request):
     client_host = request.client.host if request.client else "unknown"
@@ -138,7 +243,7 @@ async def websearch(payload: Query, request: Request):
 
 async def webchat(payload: Query) -> AsyncGenerator[str, None]:
     start_time = time.time()
-    browser_client = load_browser_client()
+    browser_client = browser_pool.client
 
     # ================================
     # Initialize components
@@ -157,6 +262,12 @@ async def webchat(payload: Query) -> AsyncGenerator[str, None]:
     stream = payload.stream
     use_youtube_transcript = payload.use_youtube_transcript
     top_k = payload.top_k if isinstance(payload.top_k, int) else None
+    budget_config = config['crawler'].get('budget', {})
+    crawl_budget = CrawlBudget(
+        deadline_ms=payload.crawl_deadline_ms if payload.crawl_deadline_ms is not None else budget_config.get('deadline_ms'),
+        quorum_sources=payload.crawl_quorum_sources if payload.crawl_quorum_sources is not None else budget_config.get('quorum_sources'),
+        quorum_min_chars=payload.crawl_quorum_min_chars if payload.crawl_quorum_min_chars is not None else budget_config.get('quorum_min_chars', 500),
+    )
 
     if search_type == "Videos":
         use_youtube_transcript = True
@@ -172,7 +283,9 @@ async def webchat(payload: Query) -> AsyncGenerator[str, None]:
                                            content_type_timeout=config['web_search']['content_type_timeout'],
                                            use_youtube_transcript=use_youtube_transcript,
                                            top_k=top_k,
-                                           exclude_domain=config['exclude_domain'])
+                                           exclude_domain=config['exclude_domain'],
+                                           search_cache=search_cache,
+                                           engine_options=config['web_search'].get('engine_options', {}).get(config['web_search']['engine']))
 
     if return_process:
         yield json_line({"status": "processing", "message": {"title": "Analyzing the question..."}})
@@ -220,7 +333,20 @@ async def webchat(payload: Query) -> AsyncGenerator[str, None]:
         if return_process:
             yield json_line({"status": "processing", "message": {"title": "Searching for related questions..."}})
 
-        if use_search_engine:
+        crawl_batches = []
+        if use_search_engine and config['web_search'].get('streaming_pipeline', False):
+            # crawl each engine response as soon as it arrives instead of waiting for the slowest search
+            scraped_sources = []
+            try:
+                async for new_sources in web_engine_client.multiple_search_stream(query_list):
+                    scraped_sources.extend(new_sources)
+                    crawl_batches.append(asyncio.ensure_future(crawler.multiple_crawl(browser_client, new_sources, crawl_budget)))
+            except BaseException:
+                for crawl_batch in crawl_batches:
+                    crawl_batch.cancel()
+                raise
+            total_results = len(scraped_sources)
+        elif use_search_engine:
             scraped_sources = await web_engine_client.multiple_search(query_list)
             total_results = len(scraped_sources)
         else:
@@ -268,11 +394,88 @@ async def webchat(payload: Query) -> AsyncGenerator[str, None]:
             }
             return outline_results
 
+        async def gather_crawl_batches(batches):
+            try:
+                results = await asyncio.gather(*batches)
+            except BaseException:
+                for batch in batches:
+                    batch.cancel()
+                raise
+            return [source for batch_results in results for source in batch_results]
+
+        async def generate_answer(sources, answer_holder):
+            """Stream (or return) the answer for *sources*; the final text goes to answer_holder["content"]."""
+            search_queries = [query] + [q["query"] for q in query_list]
+            sources = crawler.focus_contents(sources, search_queries)
+            if context_packer is not None:
+                # only the query-relevant chunks that fit the answer model's token budget
+                sources = await asyncio.to_thread(context_packer.pack, sources, search_queries)
+            prompt_web_search = json.dumps([strip_crawl_meta(source) for source in sources])
+            answer_prompt = prompts['answer_prompt'].format(persona_prompt=persona_prompt, 
+                                                            custom_prompt=custom_prompt, 
+                                                            target_language=target_language_name, 
+                                                            target_nuance=target_nuance, 
+                                                            reference_label=reference_label, 
+                                                            today_date=date_str, 
+                                                            sub_titles=str(outlines), 
+                                                            prompt_web_search=prompt_web_search)
+            if num_history_messages > 0:
+                messages = history_messages + [{"role": "user", "content": answer_prompt}]
+            else:
+                messages = [{"role": "user", "content": answer_prompt}]
+
+            if stream: # Check the renamed flag
+                collected_answer_chunks = []
+                # answer_generator.get_response now returns the stream object when stream=True
+                llm_stream_iterator = await answer_generator.get_response(
+                    messages,
+                    stream=True
+                )
+                async for chunk in llm_stream_iterator: # Iterate over LiteLLM's chunk objects
+                    if hasattr(chunk, "usage") and chunk.usage is not None:
+                        TOTAL_MODEL_USAGE[ANSWER_GENERATOR_MODEL_NAME]['usage']['input_token_count'] += chunk.usage.prompt_tokens
+                        TOTAL_MODEL_USAGE[ANSWER_GENERATOR_MODEL_NAME]['usage']['output_token_count'] += chunk.usage.completion_tokens
+                        break
+                    # Make sure chunk and its attributes are not None
+                    if chunk and chunk.choices and chunk.choices[0].delta:
+                        token_text = chunk.choices[0].delta.content
+                        if token_text is not None: # Ensure content is not None
+                            collected_answer_chunks.append(token_text)
+                            # Yield in the format requested by the user
+                            yield json_line({"status": "streaming", "delta": {"content": token_text}})
+                
+                answer_holder["content"] = "".join(collected_answer_chunks)
+
+            else: # Non-streaming answer
+                answer_response_dict = await answer_generator.get_response(
+                    messages,
+                    stream=False
+                )
+                answer_prompt_usage = answer_response_dict.get("prompt_usage", 0)
+                answer_completion_usage = answer_response_dict.get("completion_usage", 0)
+                TOTAL_MODEL_USAGE[ANSWER_GENERATOR_MODEL_NAME]['usage']['input_token_count'] += answer_prompt_usage
+                TOTAL_MODEL_USAGE[ANSWER_GENERATOR_MODEL_NAME]['usage']['output_token_count'] += answer_completion_usage
+                answer_holder["content"] = answer_response_dict.get("answer", "")
+
+        # fast first token: answer from snippets + outline while the crawl keeps running.
+        # Streaming only: a non-streamed snippet answer never reaches the client.
+        fast_first_token = payload.fast_first_token and stream and use_search_engine
+        crawl_future = None
+
         if use_search_engine:
             outline_prompt = prompts['outline_prompt'].format(query=merged_query, content=merged_content, target_language=target_language_name)
             outline_task = get_outlines(outline_prompt)
-            crawl_task = crawler.multiple_crawl(browser_client, scraped_sources)
-            outline_results, web_contents = await asyncio.gather(outline_task, crawl_task)
+            if crawl_batches:
+                crawl_task = gather_crawl_batches(crawl_batches)
+            else:
+                crawl_task = crawler.multiple_crawl(browser_client, scraped_sources, crawl_budget)
+            if fast_first_token:
+                # snapshot: the crawler mutates the source dicts in place
+                snippet_sources = [{key: src.get(key, "") for key in ("title", "url", "snippet", "date")} for src in scraped_sources]
+                crawl_future = asyncio.ensure_future(crawl_task)
+                outline_results = await outline_task
+            else:
+                outline_results, web_contents = await asyncio.gather(outline_task, crawl_task)
 
         else:
             web_contents = await crawler.crawl(browser_client, scraped_sources[0])
@@ -286,69 +489,51 @@ async def webchat(payload: Query) -> AsyncGenerator[str, None]:
         TOTAL_MODEL_USAGE[OUTLINE_GENERATOR_MODEL_NAME]['usage']['output_token_count'] += outline_results.get("completion_usage", 0)
 
         outlines = outline_results.get("outlines", [])
+        answer_holder = {"content": ""}
+        answer_mode = None
+
+        try:
+            if fast_first_token:
+                console.print(f"[pink bold]Processing time (fast first token): {time.time() - start_time:.2f} seconds")
+                async for line in generate_answer(snippet_sources, answer_holder):
+                    yield line
+                answer_mode = "snippet"
+
+                refine_config = config['answer']['fast_first_token']
+                refine = payload.refine_answer if payload.refine_answer is not None else refine_config['refine']
+                web_contents = None
+                if refine:
+                    web_contents = await crawl_future
+                    num_crawled = sum(1 for web_content in web_contents if len(web_content.get('content') or "") >= crawl_budget.quorum_min_chars)
+                if refine and num_crawled >= refine_config['min_refine_sources']:
+                    # clients replace the snippet answer with the streamed refined one
+                    yield json_line({"status": "refine", "message": {"title": "Refining the answer with crawled pages..."}})
+                    async for line in generate_answer(web_contents, answer_holder):
+                        yield line
+                    answer_mode = "refined"
+            else:
+                end_time = time.time()
+                execution_time = end_time - start_time
+                console.print(f"[pink bold]Processing time: {execution_time:.2f} seconds")
 
-        end_time = time.time()
-        execution_time = end_time - start_time
-        console.print(f"[pink bold]Processing time: {execution_time:.2f} seconds")
+                if return_process:
+                    yield json_line({"status": "processing", "message": {"title": "Web search completed"}})
 
-        if return_process:
-            yield json_line({"status": "processing", "message": {"title": "Web search completed"}})
-
-        answer_content_for_summary = ""
-        today_date = date_str
-        sub_titles = str(outlines)
-        prompt_web_search = json.dumps(web_contents)
-
-        answer_prompt = prompts['answer_prompt'].format(persona_prompt=persona_prompt, 
-                                                        custom_prompt=custom_prompt, 
-                                                        target_language=target_language_name, 
-                                                        target_nuance=target_nuance, 
-                                                        reference_label=reference_label, 
-                                                        today_date=today_date, 
-                                                        sub_titles=sub_titles, 
-                                                        prompt_web_search=prompt_web_search)
-        if num_history_messages > 0:
-            messages = history_messages + [{"role": "user", "content": answer_prompt}]
-        else:
-            messages = [{"role": "user", "content": answer_prompt}]
-
-        if stream: # Check the renamed flag
-            collected_answer_chunks = []
-            # answer_generator.get_response now returns the stream object when stream=True
-            llm_stream_iterator = await answer_generator.get_response(
-                messages,
-                stream=True
-            )
-            async for chunk in llm_stream_iterator: # Iterate over LiteLLM's chunk objects
-                if hasattr(chunk, "usage") and chunk.usage is not None:
-                    TOTAL_MODEL_USAGE[ANSWER_GENERATOR_MODEL_NAME]['usage']['input_token_count'] += chunk.usage.prompt_tokens
-                    TOTAL_MODEL_USAGE[ANSWER_GENERATOR_MODEL_NAME]['usage']['output_token_count'] += chunk.usage.completion_tokens
-                    break
-                # Make sure chunk and its attributes are not None
-                if chunk and chunk.choices and chunk.choices[0].delta:
-                    token_text = chunk.choices[0].delta.content
-                    if token_text is not None: # Ensure content is not None
-                        collected_answer_chunks.append(token_text)
-                        # Yield in the format requested by the user
-                        yield json_line({"status": "streaming", "delta": {"content": token_text}})
-            
-            answer_content_for_summary = "".join(collected_answer_chunks)
-
-        else: # Non-streaming answer
-            answer_response_dict = await answer_generator.get_response(
-                messages,
-                stream=False
-            )
-            answer_prompt_usage = answer_response_dict.get("prompt_usage", 0)
-            answer_completion_usage = answer_response_dict.get("completion_usage", 0)
-            TOTAL_MODEL_USAGE[ANSWER_GENERATOR_MODEL_NAME]['usage']['input_token_count'] += answer_prompt_usage
-            TOTAL_MODEL_USAGE[ANSWER_GENERATOR_MODEL_NAME]['usage']['output_token_count'] += answer_completion_usage
-            answer_content_for_summary = answer_response_dict.get("answer", "")
+                async for line in generate_answer(web_contents, answer_holder):
+                    yield line
+        except BaseException:
+            if crawl_future is not None:
+                crawl_future.cancel()
+            raise
+
+        answer_content_for_summary = answer_holder["content"]
 
         metadata = {
             "queries": [q["query"] for q in query_list],
             "sub_titles": outlines,
         }
+        if answer_mode is not None:
+            metadata["answer_mode"] = answer_mode
 
         usages = []
         for k, v in TOTAL_MODEL_USAGE.items():
@@ -365,20 +550,13 @@ async def webchat(payload: Query) -> AsyncGenerator[str, None]:
         }
         yield json_line(summary)
 
-        # save web contents to database
+        # save web contents to database (one bulk upsert, off the response path)
         if config['db']['save_content_to_db']:
-            for web_content in web_contents:
-                db_payload = {
-                    "url": web_content.get("url"),
-                    "title": web_content.get("title"),
-                    "snippet": web_content.get("snippet"),
-                    "content": web_content.get("content"),
-                    "date": web_content.get("date"),
-                    "language": web_content.get("language"),
-                    "type": web_content.get("type"),
-                }
-                db_payload_cleaned = {k: v for k, v in db_payload.items() if v is not None}
-                await save_document_to_pg(db_payload_cleaned)
+            # fast first token without refinement: the crawl may still be running; it is
+            # awaited by the background task, not by the stream
+            spawn_background(persist_web_contents(web_contents if web_contents is not None else crawl_future))
+        elif web_contents is None:
+            crawl_future.cancel()
 
     except asyncio.TimeoutError as exc:
         logger.error("timeout", error=str(exc))
@@ -386,8 +564,6 @@ async def webchat(payload: Query) -> AsyncGenerator[str, None]:
     except Exception as exc:  # noqa: BLE001
         logger.error("stream_error", error=str(exc))
         yield json_line({"status": "failure", "message": {"title": "Web search failed"}})
-    finally:
-        await browser_client.aclose()
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Entrypoint
@@ -1,33 +1,247 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
 import re
+import codecs
+import asyncio
+import httpx
+from bs4 import BeautifulSoup
+from rich.console import Console
+
+console = Console()
+
+# central fetch limits for crawled pages (generic pages and site-specific extractors alike)
+FETCH_TIMEOUT = httpx.Timeout(connect=0.5, read=0.8, write=0.3, pool=0.2)
+MAX_CONTENT_LENGTH = 25 * 1024 * 1024  # declared Content-Length above this: skip the page
+MAX_CONTENT_BYTES = 10 * 1024 * 1024  # stop reading the body here (the prefix is kept)
+
+try:
+    import lxml  # noqa: F401  (bs4 tree builder, faster than html.parser)
+    SOUP_FEATURES = "lxml"
+except ImportError:
+    SOUP_FEATURES = "html.parser"
+
+
+class FetchedPage:
+    """A downloaded page: status, headers and body bytes, with the text and DOM built lazily.
+
+    `soup` is parsed at most once and shared by everything that reads the page.
+    """
+
+    def __init__(self, url: str, status_code: int, headers, content: bytes, encoding: Optional[str] = None,
+                 partial: bool = False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding
+        # only a leading slice of the resource (size limit or Range request)
+        self.partial = partial
+        self._text = None
+        self._soup = None
+
+    @classmethod
+    def from_html(cls, url: str, html: str) -> "FetchedPage":
+        """A page whose HTML comes from elsewhere (e.g. a headless browser render)."""
+        page = cls(url, 200, {'content-type': 'text/html; charset=utf-8'}, html.encode("utf-8"), encoding="utf-8")
+        page._text = html
+        return page
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get('content-type', '').lower()
+
+    @property
+    def validators(self) -> dict:
+        return {"etag": self.headers.get('etag'), "last_modified": self.headers.get('last-modified')}
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            encoding = self.encoding or "utf-8"
+            try:
+                codecs.lookup(encoding)
+            except LookupError:
+                encoding = "utf-8"
+            self._text = self.content.decode(encoding, errors="replace")
+        return self._text
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.text, SOUP_FEATURES)
+        return self._soup
+
+
+async def fetch_page(url: str, browser_client, encoding: Optional[str] = None, headers: Optional[dict] = None,
+                     timeout: httpx.Timeout = FETCH_TIMEOUT, max_bytes: int = MAX_CONTENT_BYTES,
+                     byte_range: Optional[int] = None, conditional: bool = False) -> Optional[FetchedPage]:
+    """Stream *url* with the central size/time limits.
+
+    Returns None for a non-200 answer or a declared body above `MAX_CONTENT_LENGTH`;
+    bodies longer than *max_bytes* are cut there. Transport errors are raised.
+    With *byte_range*, only the first *byte_range* bytes are requested (`Range`) and
+    read, and a 206 answer is accepted; `FetchedPage.partial` tells whether more exists.
+    With *conditional* (If-None-Match / If-Modified-Since in *headers*), a 304 answer
+    is returned as a bodiless page with status_code 304.
+    """
+    if byte_range:
+        headers = {**(headers or {}), 'Range': f"bytes=0-{byte_range - 1}"}
+        max_bytes = min(max_bytes, byte_range)
+    async with browser_client.stream('GET', url, headers=headers, timeout=timeout) as response:
+        if conditional and response.status_code == 304:
+            return FetchedPage(url, 304, response.headers, b'')
+        if response.status_code != 200 and not (byte_range and response.status_code == 206):
+            return None
+
+        content_length = response.headers.get('content-length')
+        if content_length and content_length.isdigit() and int(content_length) > MAX_CONTENT_LENGTH:
+            return None
+
+        chunks = []
+        total_size = 0
+        partial = False
+        async for chunk in response.aiter_bytes(chunk_size=8192):  # 8KB 청크
+            total_size += len(chunk)
+            if total_size > max_bytes:
+                partial = True
+                break
+            chunks.append(chunk)
+
+        if response.status_code == 206:
+            # Content-Range: bytes 0-1048575/5242880
+            resource_size = response.headers.get('content-range', '').rpartition('/')[2]
+            partial = partial or not resource_size.isdigit() or int(resource_size) > total_size
+
+        return FetchedPage(url, response.status_code, response.headers, b''.join(chunks),
+                           encoding=encoding or response.charset_encoding, partial=partial)
+
 
 class ContentExtractor(ABC):
-    """콘텐츠 추출기 기본 클래스"""
-    
+    """콘텐츠 추출기 기본 클래스
+
+    Site extractors implement `parse` and receive a `FetchedPage` downloaded by
+    `extract` under the central limits; the parse runs in a thread, bounded by
+    `parse_timeout`. Extractors that do not read the page HTML (APIs, transcripts)
+    override `extract` instead; the default `parse` is the generic HTML conversion.
+    With `rendered`, the page comes from the shared headless-browser `RenderService`
+    (set by the Crawler), and from a plain fetch when there is none or it is saturated.
+    """
+
+    # hosts served by this extractor (subdomains included); indexed by ExtractorRegistry
+    domains: Iterable[str] = ()
+    # charset override for sites that declare none / a wrong one
+    encoding: Optional[str] = None
+    parse_timeout: float = 1.5
+    # pages need JavaScript: render them with `render_service`
+    rendered: bool = False
+    render_service = None
+    # backend of the default `parse` (set by the Crawler to its configured parser)
+    html_parser: str = "bs4"
+
     @abstractmethod
     def can_handle(self, url: str) -> bool:
         """해당 URL을 처리할 수 있는지 확인"""
         pass
-    
-    @abstractmethod
-    async def extract(self, url: str, browser_client) -> str:
-        """콘텐츠 추출"""
-        pass
+
+    def resolve_url(self, url: str) -> str:
+        """실제로 요청할 URL (모바일 → 데스크톱 페이지 등)"""
+        return url
+
+    def parse(self, page: FetchedPage) -> str:
+        """가져온 페이지에서 본문 추출
+
+        Default: the generic HTML -> text conversion with `html_parser`, for extractors
+        that only change how a page is fetched (or pages their `extract` does not handle).
+        """
+        # imported here: html_engine imports this package's submodules
+        from .html_engine import convert_html
+        return convert_html(page.text, page.url, self.html_parser)
+
+    async def render_page(self, url: str) -> Optional[FetchedPage]:
+        """*url* rendered by the headless-browser pool (None without one, or when it is busy)."""
+        if self.render_service is None:
+            return None
+        html = await self.render_service.render(url)
+        return FetchedPage.from_html(url, html) if html else None
+
+    async def extract(self, url: str, browser_client, validators: Optional[dict] = None,
+                      page: Optional[FetchedPage] = None) -> str:
+        """콘텐츠 추출
+
+        *page*: the page already downloaded for `resolve_url(url)` (e.g. by a conditional
+        GET that answered 200), parsed instead of fetching again. *validators* is
+        filled with the ETag / Last-Modified of the page that was parsed.
+        """
+        try:
+            url = self.resolve_url(url)
+            if self.rendered:
+                page = await self.render_page(url) or page
+            if page is None:
+                page = await fetch_page(url, browser_client, encoding=self.encoding)
+            if page is None:
+                return ""
+            if self.encoding and page.encoding != self.encoding:
+                # charset override, also for a page downloaded by the caller
+                page.encoding = self.encoding
+            if validators is not None:
+                validators.update(page.validators)
+            return await asyncio.wait_for(asyncio.to_thread(self.parse, page), timeout=self.parse_timeout)
+        except asyncio.TimeoutError:
+            console.log(f"[red]{type(self).__name__}: parse timed out for {url}")
+            return ""
+        except Exception as e:
+            console.log(f"[red]{type(self).__name__}: {url}: {e}")
+            return ""
+
+def url_host(url: str) -> str:
+    """Lowercased hostname of *url* ("" if it has none)."""
+    try:
+        return (urlsplit(url.strip()).hostname or "").lower()
+    except ValueError:
+        return ""
+
 
 class ExtractorRegistry:
-    """추출기 레지스트리"""
-    
-    def __init__(self):
-        self._extractors = []
-    
+    """추출기 레지스트리
+
+    Extractors are indexed by host suffix (`ContentExtractor.domains`): a lookup
+    walks the labels of the URL's hostname, longest suffix first, so
+    "news.sbs.co.kr" tries "news.sbs.co.kr", "sbs.co.kr", "co.kr", "kr" and dispatch
+    cost does not grow with the number of sites. Extractors without `domains`, and
+    every extractor when `substring_fallback` is on, are also tried with
+    `can_handle` (the former substring scan) when no host matches.
+    """
+
+    def __init__(self, substring_fallback: bool = False):
+        self.substring_fallback = substring_fallback
+        self._by_host: Dict[str, ContentExtractor] = {}
+        self._extractors: List[ContentExtractor] = []
+        self._unindexed: List[ContentExtractor] = []
+
     def register(self, extractor: ContentExtractor):
         """추출기 등록"""
         self._extractors.append(extractor)
-    
+        domains = [domain.lower().strip(".") for domain in extractor.domains]
+        if not domains:
+            self._unindexed.append(extractor)
+        for domain in domains:
+            # first registration wins, as in the former ordered scan
+            self._by_host.setdefault(domain, extractor)
+
+    def extractors(self) -> List[ContentExtractor]:
+        return list(self._extractors)
+
     def get_extractor(self, url: str) -> Optional[ContentExtractor]:
         """URL에 맞는 추출기 반환"""
-        for extractor in self._extractors:
+        host = url_host(url)
+        while host:
+            extractor = self._by_host.get(host)
+            if extractor is not None:
+                return extractor
+            _, _, host = host.partition(".")
+
+        for extractor in (self._extractors if self.substring_fallback else self._unindexed):
             if extractor.can_handle(url):
                 return extractor
-        return None
\ No newline at end of file
+        return None
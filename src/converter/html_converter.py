@@ -1,11 +1,24 @@
 import io
 import re
-from typing import Any, BinaryIO, Optional, Union
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
 from bs4 import BeautifulSoup
+from structlog import get_logger
 from .stream_info import StreamInfo
 from .base_converter import DocumentConverterResult
 from .markdownify import _CustomMarkdownify
 
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+logger = get_logger(__name__)
+
 ACCEPTED_MIME_TYPE_PREFIXES = [
     "text/html",
     "application/xhtml",
@@ -17,8 +30,157 @@ ACCEPTED_FILE_EXTENSIONS = [
 ]
 
 
+# tags dropped with their content, and inline styles that hide an element
+REMOVED_TAGS = ["script", "style", 'nav', 'navbar', 'navigation', 'menu', 'sidebar', 'side-bar',
+                'aside', 'header', 'footer']
+HIDDEN_STYLE = re.compile(r"display:\s*none", re.I)
+# text bs4's get_text() leaves out (TemplateString, RubyTextString, RubyParenthesisString)
+SKIPPED_TEXT_TAGS = ["template", "rt", "rp"]
+# bs4 (BeautifulSoup.endData) turns a whitespace-only string outside these into "\n" or " "
+PRESERVE_WHITESPACE_TAGS = {"pre", "textarea"}
+ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+def _normalize_text(text: str) -> str:
+    # 여러 공백과 줄바꿈 정리
+    text = re.sub(r'\n+', '\n', text)
+    text = re.sub(r' +', ' ', text)
+    return text.strip()
+
+
+def _collapse_whitespace(text: str) -> str:
+    if text and not text.strip(ASCII_SPACES):
+        return "\n" if "\n" in text else " "
+    return text
+
+
+def _extract_bs4(html_str: str) -> Tuple[str, Optional[str]]:
+    """Reference backend: BeautifulSoup with the pure-Python html.parser."""
+    soup = BeautifulSoup(html_str, "html.parser")
+
+    # 스크립트와 스타일 태그 제거
+    for script in soup(REMOVED_TAGS):
+        script.decompose()
+
+    # 숨겨진 요소들도 제거 (선택사항)
+    for hidden in soup.find_all(attrs={"style": HIDDEN_STYLE}):
+        hidden.decompose()
+
+    # 모든 텍스트 추출 (간단한 방법)
+    return soup.get_text(), None if soup.title is None else soup.title.string
+
+
+def _lxml_preserves_whitespace(element) -> bool:
+    return any(ancestor.tag in PRESERVE_WHITESPACE_TAGS for ancestor in element.iterancestors())
+
+
+def _extract_lxml(html_str: str) -> Tuple[str, Optional[str]]:
+    """libxml2 parser; same removals as `_extract_bs4`, text of the remaining tree."""
+    root = lxml_html.document_fromstring(html_str)
+
+    # before any drop_tree, which merges a tail into the text before it
+    for element in root.iter():
+        # only whitespace-only strings change; the ancestor check is for those
+        text, tail = element.text, element.tail
+        if isinstance(element.tag, str) and text and not text.strip(ASCII_SPACES) \
+                and element.tag not in PRESERVE_WHITESPACE_TAGS and not _lxml_preserves_whitespace(element):
+            element.text = _collapse_whitespace(text)
+        if tail and not tail.strip(ASCII_SPACES) and not _lxml_preserves_whitespace(element):
+            element.tail = _collapse_whitespace(tail)
+
+    for element in list(root.iter(*REMOVED_TAGS, *SKIPPED_TEXT_TAGS)):
+        if element.getparent() is not None:
+            element.drop_tree()  # keeps the tail text, like bs4's decompose
+
+    for hidden in root.xpath("//*[@style]"):
+        if HIDDEN_STYLE.search(hidden.get("style")) and hidden.getparent() is not None:
+            hidden.drop_tree()
+
+    title = root.find(".//title")
+    # bs4's `.string`: only a title made of a single text node has one
+    title_text = title.text if title is not None and len(title) == 0 else None
+    # text() nodes only: comments and processing instructions are skipped as in get_text()
+    return "".join(root.xpath("//text()")), title_text
+
+
+def _extract_selectolax(html_str: str) -> Tuple[str, Optional[str]]:
+    """lexbor (HTML5) parser through selectolax; same removals as `_extract_bs4`."""
+    tree = LexborHTMLParser(html_str)
+    tree.strip_tags(REMOVED_TAGS + SKIPPED_TEXT_TAGS)
+
+    hidden = [node for node in tree.css("[style]") if HIDDEN_STYLE.search(node.attributes.get("style") or "")]
+    hidden_ids = {node.mem_id for node in hidden}
+    for node in hidden:
+        # decomposing a node frees its subtree; skip nodes inside an already removed one
+        parent, nested = node.parent, False
+        while parent is not None:
+            if parent.mem_id in hidden_ids:
+                nested = True
+                break
+            parent = parent.parent
+        if not nested:
+            node.decompose()
+
+    title = tree.css_first("title")
+    title_text = (title.text(deep=False) or None) if title is not None else None
+    if title_text is not None:
+        title_text = _collapse_whitespace(title_text)
+    root = tree.root
+    if root is None:
+        return "", title_text
+    texts = []
+    for node in root.traverse(include_text=True):
+        if node.tag == "-text":
+            text = node.text_content or ""
+            if not text.strip(ASCII_SPACES) and not _lexbor_preserves_whitespace(node):
+                text = _collapse_whitespace(text)
+            texts.append(text)
+    return "".join(texts), title_text
+
+
+def _lexbor_preserves_whitespace(node) -> bool:
+    parent = node.parent
+    while parent is not None:
+        if parent.tag in PRESERVE_WHITESPACE_TAGS:
+            return True
+        parent = parent.parent
+    return False
+
+
+# backend name -> extractor returning (raw text, title); bs4 is the reference output
+PARSERS: Dict[str, Callable[[str], Tuple[str, Optional[str]]]] = {
+    "bs4": _extract_bs4,
+    "lxml": _extract_lxml,
+    "selectolax": _extract_selectolax,
+}
+
+
+def available_parsers() -> List[str]:
+    """Backends whose library is installed (lxml and selectolax are optional)."""
+    available = ["bs4"]
+    if lxml_html is not None:
+        available.append("lxml")
+    if LexborHTMLParser is not None:
+        available.append("selectolax")
+    return available
+
+
 class HtmlConverter:
-    """Anything with content type text/html"""
+    """Anything with content type text/html
+
+    `parser` picks the backend: "bs4" (html.parser, reference), "lxml" or
+    "selectolax" (C parsers, optional imports; unavailable ones fall back to bs4).
+    All backends return the same `DocumentConverterResult`.
+    """
+
+    def __init__(self, parser: str = "bs4"):
+        if parser not in PARSERS:
+            raise ValueError(f"Invalid html parser: {parser}")
+        if parser not in available_parsers():
+            logger.warning("html_parser_unavailable", parser=parser, fallback="bs4")
+            parser = "bs4"
+        self.parser = parser
+        self._extract = PARSERS[parser]
 
     # def convert(
     #     self,
@@ -116,31 +278,19 @@ class HtmlConverter:
         stream_info: StreamInfo,
         **kwargs: Any,
     ) -> DocumentConverterResult:
-        # str 타입인 경우 바로 BeautifulSoup에 넘기기
-        if isinstance(file_stream, str):
-            soup = BeautifulSoup(file_stream, "html.parser")
-        else:
+        # str 타입인 경우 바로 파서에 넘기기
+        if not isinstance(file_stream, str):
             return ""
 
-        # 스크립트와 스타일 태그 제거
-        for script in soup(["script", "style", 'nav', 'navbar', 'navigation', 'menu', 'sidebar', 'side-bar', 
-            'aside', 'header', 'footer']):
-            script.decompose()
-        
-        # 숨겨진 요소들도 제거 (선택사항)
-        for hidden in soup.find_all(attrs={"style": re.compile(r"display:\s*none", re.I)}):
-            hidden.decompose()
-        
-        # 모든 텍스트 추출 (간단한 방법)
-        text = soup.get_text()
-        # 여러 공백과 줄바꿈 정리
-        text = re.sub(r'\n+', '\n', text)
-        webpage_text = re.sub(r' +', ' ', text)
-        webpage_text = webpage_text.strip()
+        try:
+            text, title = self._extract(file_stream)
+        except Exception:
+            # e.g. lxml refuses str input with an XML encoding declaration; html.parser takes anything
+            text, title = _extract_bs4(file_stream)
 
         return DocumentConverterResult(
-            markdown=webpage_text,
-            title=None if soup.title is None else soup.title.string,
+            markdown=_normalize_text(text),
+            title=title,
         )
 
     def convert_string(
@@ -160,4 +310,48 @@ class HtmlConverter:
                 url=url,
             ),
             **kwargs,
-        )
\ No newline at end of file
+        )
+
+def _benchmark_parser(parser: str, pages: List[str], rounds: int = 3) -> Tuple[float, float]:
+    """pages/sec and peak RSS (MB) of one backend; run in a fresh process (see `__main__`)."""
+    import time
+    import resource
+
+    converter = HtmlConverter(parser)
+    converter.convert_string(pages[0])
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for page in pages:
+            converter.convert_string(page)
+    elapsed = time.perf_counter() - start
+    return rounds * len(pages) / elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+if __name__ == "__main__":
+    # benchmark: python -m src.converter.html_converter (golden output: tests/test_html_converter.py)
+    import random
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    available = available_parsers()
+    print(f"backends: {available}")
+    random.seed(0)
+    vocabulary = ["서울", "경제", "시장", "기술", "search", "engine", "market", "news", "data", "model"]
+
+    def make_page(paragraphs: int = 400) -> str:
+        body = "".join(
+            f"<div class='row'><p style='color:red'>{' '.join(random.choices(vocabulary, k=40))}</p>"
+            f"<div style='display:none'>hidden</div>"
+            f"<span><a href='/x/{i}'>{' '.join(random.choices(vocabulary, k=5))}</a></span></div>"
+            for i in range(paragraphs)
+        )
+        return (f"<html><head><title>t</title><style>p{{}}</style><script>var x=1;</script></head>"
+                f"<body><nav>menu</nav><header>h</header>{body}<footer>f</footer></body></html>")
+
+    pages = [make_page() for _ in range(10)]
+    print(f"page size ~{len(pages[0]) // 1024} KB")
+    context = multiprocessing.get_context("spawn")
+    for parser in available:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            pages_per_sec, peak_mb = executor.submit(_benchmark_parser, parser, pages).result()
+        print(f"{parser:10s} {pages_per_sec:8.1f} pages/s  peak RSS {peak_mb:7.1f} MB")
@@ -0,0 +1,146 @@
+import os
+import asyncio
+from typing import Dict, Optional
+from structlog import get_logger
+from src.utils.process_pool import WarmProcessPool
+from .html_converter import HtmlConverter
+
+logger = get_logger(__name__)
+
+# one converter per parser backend and process (pool workers and the thread path alike)
+_converters: Dict[str, HtmlConverter] = {}
+
+
+def _get_converter(parser: str = "bs4") -> HtmlConverter:
+    if parser not in _converters:
+        _converters[parser] = HtmlConverter(parser)
+    return _converters[parser]
+
+
+def convert_html(html_str: str, url: Optional[str] = None, parser: str = "bs4") -> str:
+    """HTML -> text with `HtmlConverter`; "" on failure (same contract as `Crawler.extract_html_text`)."""
+    try:
+        return _get_converter(parser).convert_string(html_str, url=url).markdown.strip()
+    except Exception:
+        return ""
+
+
+def _warm_up(parser: str = "bs4") -> int:
+    # import the parser / build the converter and touch it once so the first real page is not slow
+    convert_html("<html><head><title>warm</title></head><body><p>up</p></body></html>", parser=parser)
+    return os.getpid()
+
+
+class HtmlConversionEngine:
+    """Runs `HtmlConverter` off the event loop, in threads or in a process pool.
+
+    BeautifulSoup parsing is pure Python, so under load the thread path serialises on
+    the GIL and conversions run into their timeout. The process mode keeps warm
+    worker processes (spawned at `start`) and bounds the number of pages waiting
+    for a worker with `max_pending`; callers beyond that wait for a slot, counted
+    against the same `timeout`.
+
+    Parameters
+    ----------
+    mode : str
+        "process" (ProcessPoolExecutor) or "thread" (`asyncio.to_thread`, former behaviour).
+    parser : str
+        `HtmlConverter` backend: "bs4", "lxml" or "selectolax" (falls back to bs4 if not installed).
+    max_workers : int, optional
+        Worker processes (defaults to the CPU count).
+    max_pending : int
+        Conversions submitted to the pool at once (queue depth).
+    timeout : float
+        Seconds per conversion, including the wait for a slot; on timeout "" is returned.
+    """
+
+    def __init__(self, mode: str = "thread", parser: str = "bs4", max_workers: Optional[int] = None,
+                 max_pending: int = 64, timeout: float = 0.5):
+        if mode not in ("process", "thread"):
+            raise ValueError(f"Invalid html conversion mode: {mode}")
+        self.mode = mode
+        self.parser = _get_converter(parser).parser
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pool = WarmProcessPool("html_engine", self.max_workers, _warm_up, (self.parser,))
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.timeouts = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        """Spawn and warm the worker processes (no-op in thread mode)."""
+        if self.mode != "process":
+            return
+        self._pool.start()
+        logger.info("html_engine_started", mode=self.mode, parser=self.parser, max_pending=self.max_pending)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+
+    async def _run_in_pool(self, html_str: str, url: Optional[str]) -> str:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        async with self._slots:
+            # a dead worker (e.g. OOM on a huge page) gives "" and one rebuild, off the loop
+            return await self._pool.run(convert_html, html_str, url, self.parser, default="")
+
+    async def convert(self, html_str: str, url: Optional[str] = None) -> str:
+        if self.mode == "process":
+            conversion = self._run_in_pool(html_str, url)
+        else:
+            conversion = asyncio.to_thread(convert_html, html_str, url, self.parser)
+        try:
+            return await asyncio.wait_for(conversion, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return ""
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "parser": self.parser, "workers": self.max_workers if self.mode == "process" else None,
+                "timeouts": self.timeouts, "pool_rebuilds": self._pool.rebuilds}
+
+
+if __name__ == "__main__":
+    # benchmark: python -m src.converter.html_engine
+    import time
+    import random
+
+    random.seed(0)
+    words = ["서울", "경제", "시장", "기술", "search", "engine", "market", "news", "data", "model"]
+
+    def make_page(paragraphs: int = 400) -> str:
+        body = "".join(
+            f"<div class='row'><p style='color:red'>{' '.join(random.choices(words, k=40))}</p>"
+            f"<span><a href='/x/{i}'>{' '.join(random.choices(words, k=5))}</a></span></div>"
+            for i in range(paragraphs)
+        )
+        return (f"<html><head><title>t</title><style>p{{}}</style><script>var x=1;</script></head>"
+                f"<body><nav>menu</nav><header>h</header>{body}<footer>f</footer></body></html>")
+
+    pages = [make_page() for _ in range(8)]
+    print(f"page size ~{len(pages[0]) // 1024} KB, cpus={os.cpu_count()}")
+
+    async def run(engine: HtmlConversionEngine, concurrency: int):
+        start = time.perf_counter()
+        results = await asyncio.gather(*[engine.convert(pages[i % len(pages)]) for i in range(concurrency)])
+        elapsed = time.perf_counter() - start
+        empty = sum(1 for result in results if not result)
+        return elapsed, empty
+
+    async def main():
+        for mode, parser in (("thread", "bs4"), ("process", "bs4"), ("thread", "lxml"), ("process", "lxml")):
+            engine = HtmlConversionEngine(mode=mode, parser=parser, timeout=30)
+            engine.start()
+            await engine.convert(pages[0])
+            for concurrency in (1, 10, 50):
+                elapsed, empty = await run(engine, concurrency)
+                # with the production 0.5 s timeout, how many would have come back empty
+                strict = HtmlConversionEngine(mode=mode, parser=parser, timeout=0.5)
+                strict._pool, strict.max_workers = engine._pool, engine.max_workers
+                _, strict_empty = await run(strict, concurrency)
+                print(f"{mode:7s} {parser:5s} concurrency={concurrency:3d} wall={elapsed * 1000:8.1f} ms "
+                      f"per_page={elapsed / concurrency * 1000:7.1f} ms empty@0.5s={strict_empty}/{concurrency}")
+            engine.shutdown()
+
+    asyncio.run(main())
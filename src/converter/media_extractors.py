@@ -1,28 +1,181 @@
+import sys
+import asyncio
+import httpx
+from typing import Optional
+from rich.console import Console
+from src.utils.cache import TTLByteLRUCache
+from src.utils.rate_limiter import IntervalRateLimiter
 from . import ContentExtractor
-from .medias.youtube.base import get_transcript, get_video_id
+from .medias.youtube.base import focus_transcript, get_video_id
+from .medias.youtube.engine import TranscriptEngine
 from .medias.wiki.url2md_async import async_extract_wiki_content
+from .medias.wiki.engine import WikipediaEngine
+from .medias.arxiv.url2md_async import (API_INTERVAL, ABS_URL, parse_arxiv_url, fetch_arxiv_metadata,
+                                        fetch_arxiv_html_text, fetch_arxiv_pdf_text, format_metadata)
+
+console = Console()
 
 
 class YoutubeExtractor(ContentExtractor):
+    """YouTube transcripts, fetched through a `TranscriptEngine` (threads, bounded, cached).
+
+    Parameters
+    ----------
+    relevant_segments : int
+        When > 0, `focus` keeps about this many query-relevant segments of a transcript
+        for the prompt (the crawled content itself stays complete).
+    context_segments : int
+        Neighbouring segments kept on each side of a relevant one.
+    **engine_options
+        `TranscriptEngine` options (max_concurrency, timeout, languages, cache_bytes, ttl).
+    """
+
+    domains = ("youtube.com", "youtu.be")
+
+    def __init__(self, relevant_segments: int = 0, context_segments: int = 1, **engine_options):
+        self.relevant_segments = relevant_segments
+        self.context_segments = context_segments
+        self.engine = TranscriptEngine(**engine_options)
+
     def can_handle(self, url: str) -> bool:
-        return "youtube.com" in url
-    
-    async def extract(self, url: str, browser_client) -> str:
+        return "youtube.com" in url or "youtu.be" in url
+
+    async def extract(self, url: str, browser_client, validators=None, page=None) -> str:
         video_id = get_video_id(url)
-        content = await get_transcript(video_id)
+        content = await self.engine.get(video_id)
         return content
 
+    def focus(self, content: str, queries) -> str:
+        """Only the transcript segments relevant to *queries* (unchanged when disabled)."""
+        if self.relevant_segments <= 0:
+            return content
+        return focus_transcript(content, queries, self.relevant_segments, self.context_segments)
+
 
 class WikipediaExtractor(ContentExtractor):
+    """Wikipedia articles through a `WikipediaEngine` (REST Parsoid HTML, sections
+    up to a token budget, cached by revision); other wiki pages, or an article the
+    REST API does not serve, go through the former full-page conversion.
+
+    Parameters
+    ----------
+    **engine_options
+        `WikipediaEngine` options (max_tokens, timeout, cache_bytes, revision_ttl).
+    """
+
+    domains = ("wikipedia.org",)
+
+    def __init__(self, **engine_options):
+        self.engine = WikipediaEngine(**engine_options)
+
     def can_handle(self, url: str) -> bool:
         return "wikipedia.org" in url
-    
-    async def extract(self, url: str, browser_client) -> str:
-        content = await async_extract_wiki_content(url, browser_client)
+
+    async def extract(self, url: str, browser_client, validators=None, page=None) -> str:
+        try:
+            content = await self.engine.extract(url, browser_client)
+        except (httpx.HTTPError, asyncio.TimeoutError) as e:
+            # REST API slow or failing mid-stream: the article page may still load
+            console.log(f"[red]Wikipedia: REST HTML of {url} failed ({type(e).__name__}), falling back")
+            content = None
+        if not content:
+            content = await async_extract_wiki_content(url, browser_client)
+        return content
+
+
+class ArxivExtractor(ContentExtractor):
+    """arXiv papers from the export API (metadata + abstract) and the HTML rendition,
+    instead of parsing the PDF.
+
+    Parameters
+    ----------
+    full_text : bool
+        Append the body of arxiv.org/html/<id> when arXiv has one.
+    pdf_fallback : bool
+        Read the PDF when there is no HTML rendition (off: metadata + abstract only), with
+        the crawler's `pdf_engine`.
+    max_chars : int
+        Budget of the full text.
+    timeout : float
+        Seconds per arXiv request.
+    cache_bytes : int
+        Per-process cache of extracted papers, keyed by (id, version); a version never changes.
+    latest_ttl : float
+        Seconds an unversioned URL keeps resolving to the version seen last.
+    api_interval : float
+        Minimum seconds between export API requests (cache misses only).
+    api_state_path : str, optional
+        File that shares `api_interval` among the uvicorn workers of the host (flock);
+        None: each worker keeps its own interval.
+    api_max_wait : float
+        Seconds a paper waits for its API slot; past that the abs page is converted instead.
+    """
+
+    domains = ("arxiv.org",)
+    # set by the Crawler (PDF text for pdf_fallback)
+    pdf_engine = None
+
+    def __init__(self, full_text: bool = True, pdf_fallback: bool = False, max_chars: int = 20000,
+                 timeout: float = 3.0, cache_bytes: int = 16 * 1024 * 1024, latest_ttl: float = 3600,
+                 api_interval: float = API_INTERVAL, api_max_wait: float = 1.0,
+                 api_state_path: Optional[str] = None):
+        self.full_text = full_text
+        self.pdf_fallback = pdf_fallback
+        self.max_chars = max_chars
+        self.timeout = timeout
+        self.latest_ttl = latest_ttl
+        self.cache = TTLByteLRUCache(max_bytes=cache_bytes)
+        self.api_limiter = IntervalRateLimiter(api_interval, state_path=api_state_path)
+        self.api_max_wait = api_max_wait
+
+    def can_handle(self, url: str) -> bool:
+        return "arxiv.org" in url
+
+    async def extract(self, url: str, browser_client, validators=None, page=None) -> str:
+        parsed = parse_arxiv_url(url)
+        if parsed is None:
+            # arxiv.org pages that are not a paper (listings, help): default parse, crawler's HTML parser
+            return await super().extract(url, browser_client, validators, page)
+        arxiv_id, version = parsed
+        version = version or self.cache.get(("latest", arxiv_id))
+        if version and (cached := self.cache.get((arxiv_id, version))) is not None:
+            return cached
+
+        if not await self.api_limiter.acquire(self.api_max_wait):
+            # API slots taken for longer than the crawl can wait: the abs page has title and abstract
+            return await super().extract(ABS_URL.format(f"{arxiv_id}{version or ''}"), browser_client)
+        meta = await fetch_arxiv_metadata(arxiv_id, version, browser_client, timeout=self.timeout)
+        if meta is None:
+            console.log(f"[red]arXiv: no metadata for {arxiv_id}{version or ''}")
+            return ""
+        version = meta["version"] or version or ""
+        if not parsed[1]:
+            self.cache.set(("latest", arxiv_id), version, ttl=self.latest_ttl, size=64)
+        if (cached := self.cache.get((arxiv_id, version))) is not None:
+            return cached
+
+        content = format_metadata(arxiv_id, meta)
+        body = ""
+        if self.full_text:
+            try:
+                body = await fetch_arxiv_html_text(f"{arxiv_id}{version}", browser_client, self.max_chars,
+                                                   timeout=self.timeout)
+                if not body and self.pdf_fallback and self.pdf_engine is not None:
+                    body = await fetch_arxiv_pdf_text(f"{arxiv_id}{version}", browser_client, self.pdf_engine,
+                                                      self.max_chars, timeout=self.timeout)
+            except Exception as e:
+                # metadata and abstract are still worth returning (but not caching)
+                console.log(f"[red]arXiv: full text of {arxiv_id}{version}: {e}")
+                return content
+        if body:
+            content += "\n\n## Full text\n" + body
+
+        self.cache.set((arxiv_id, version), content, size=sys.getsizeof(content))
         return content
 
 
 MEDIA_EXTRACTORS = {
     "youtube.com": YoutubeExtractor,
     "wikipedia.org": WikipediaExtractor,
+    "arxiv.org": ArxivExtractor,
 }
\ No newline at end of file
@@ -0,0 +1,145 @@
+import re
+import asyncio
+import xml.etree.ElementTree as ET
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from bs4 import BeautifulSoup
+from src.converter import SOUP_FEATURES, fetch_page
+
+API_URL = "https://export.arxiv.org/api/query"
+# export API terms of use: no more than one request every three seconds
+API_INTERVAL = 3.0
+ABS_URL = "https://arxiv.org/abs/{}"
+HTML_URL = "https://arxiv.org/html/{}"
+PDF_URL = "https://arxiv.org/pdf/{}"
+ATOM = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
+
+# new-style (2301.01234) and old-style (hep-th/9901001, math.AG/0601001) identifiers, optional version
+ARXIV_URL = re.compile(
+    r"arxiv\.org/(?:abs|pdf|html|format)/(\d{4}\.\d{4,5}|[a-z][a-z\-]*(?:\.[A-Z]{2})?/\d{7})(v\d+)?",
+    re.IGNORECASE,
+)
+VERSION = re.compile(r"(v\d+)$")
+
+# LaTeXML (arxiv.org/html) parts that are not body text; the abstract comes from the API
+LATEXML_REMOVED = ("script, style, nav, header, footer, .ltx_page_footer, .ltx_bibliography, .ltx_authors, "
+                   ".ltx_abstract, .ltx_title_document, .ltx_dates, .ltx_note, .ltx_tag_bibitem")
+LATEXML_BLOCKS = "h2.ltx_title, h3.ltx_title, h4.ltx_title, p.ltx_p, .ltx_caption"
+
+
+def parse_arxiv_url(url: str) -> Optional[Tuple[str, Optional[str]]]:
+    """(arXiv id, version or None) of an abs/pdf/html URL, None for other arxiv.org pages."""
+    match = ARXIV_URL.search(url)
+    if not match:
+        return None
+    return match.group(1), (match.group(2) or None)
+
+
+def parse_atom_entry(xml_bytes: bytes) -> Optional[Dict[str, Any]]:
+    """Metadata of the first entry of an export API answer (None if missing or an error entry)."""
+    root = ET.fromstring(xml_bytes)
+    entry = root.find("atom:entry", ATOM)
+    if entry is None:
+        return None
+    entry_id = (entry.findtext("atom:id", "", ATOM) or "").strip()
+    if "/abs/" not in entry_id:
+        # unknown ids come back as an entry titled "Error" pointing at the API
+        return None
+    version = VERSION.search(entry_id)
+    primary = entry.find("arxiv:primary_category", ATOM)
+    return {
+        "title": " ".join((entry.findtext("atom:title", "", ATOM) or "").split()),
+        "abstract": " ".join((entry.findtext("atom:summary", "", ATOM) or "").split()),
+        "authors": [(author.findtext("atom:name", "", ATOM) or "").strip() for author in entry.findall("atom:author", ATOM)],
+        "published": (entry.findtext("atom:published", "", ATOM) or "")[:10],
+        "updated": (entry.findtext("atom:updated", "", ATOM) or "")[:10],
+        "version": version.group(1) if version else None,
+        "primary_category": primary.get("term") if primary is not None else None,
+        "categories": [category.get("term") for category in entry.findall("atom:category", ATOM)],
+        "comment": " ".join((entry.findtext("arxiv:comment", "", ATOM) or "").split()),
+    }
+
+
+def format_metadata(arxiv_id: str, meta: Dict[str, Any]) -> str:
+    lines = [f"# {meta['title']}"]
+    if meta["authors"]:
+        authors = meta["authors"]
+        lines.append("Authors: " + ", ".join(authors[:20]) + (f" and {len(authors) - 20} others" if len(authors) > 20 else ""))
+    dates = f"Published: {meta['published']}"
+    if meta["updated"] and meta["updated"] != meta["published"]:
+        dates += f" (updated {meta['updated']})"
+    lines.append(dates)
+    if meta["categories"]:
+        lines.append("Categories: " + ", ".join(meta["categories"]))
+    lines.append(f"arXiv: {arxiv_id}{meta['version'] or ''}")
+    if meta["comment"]:
+        lines.append(f"Comment: {meta['comment']}")
+    lines += ["", "## Abstract", meta["abstract"]]
+    return "\n".join(lines)
+
+
+def extract_latexml_text(html: str, max_chars: int) -> str:
+    """Section headings and paragraphs of an arxiv.org/html (LaTeXML) paper, up to *max_chars*."""
+    soup = BeautifulSoup(html, SOUP_FEATURES)
+    article = soup.select_one("article.ltx_document") or soup.body or soup
+    for removed in article.select(LATEXML_REMOVED):
+        removed.decompose()
+    for math in article.select("math"):
+        # MathML text is a soup of tokens; the TeX source reads better
+        math.replace_with(f" {math.get('alttext', '')} ")
+
+    blocks: List[str] = []
+    total = 0
+    for element in article.select(LATEXML_BLOCKS):
+        text = " ".join(element.get_text(" ", strip=True).split())
+        if not text:
+            continue
+        if element.name in ("h2", "h3", "h4"):
+            text = f"\n{'#' * int(element.name[1])} {text}"
+        blocks.append(text)
+        total += len(text) + 1
+        if total >= max_chars:
+            break
+    return "\n".join(blocks)[:max_chars].strip()
+
+
+async def fetch_arxiv_metadata(arxiv_id: str, version: Optional[str], browser_client,
+                               timeout: float = 3.0) -> Optional[Dict[str, Any]]:
+    response = await browser_client.get(API_URL, params={"id_list": f"{arxiv_id}{version or ''}"},
+                                        timeout=httpx.Timeout(timeout))
+    if response.status_code != 200:
+        return None
+    return parse_atom_entry(response.content)
+
+
+async def fetch_arxiv_html_text(versioned_id: str, browser_client, max_chars: int, timeout: float = 3.0) -> str:
+    """Body text of the HTML rendition ("" when arXiv has none for this paper)."""
+    page = await fetch_page(HTML_URL.format(versioned_id), browser_client, timeout=httpx.Timeout(timeout))
+    if page is None or "html" not in page.content_type:
+        return ""
+    return await asyncio.to_thread(extract_latexml_text, page.text, max_chars)
+
+
+async def fetch_arxiv_pdf_text(versioned_id: str, browser_client, pdf_engine, max_chars: int,
+                               timeout: float = 3.0) -> str:
+    """Text of the PDF through the crawler's `PdfExtractionEngine` (its workers, timeout
+    and leading-bytes Range request); the whole file only if those bytes hold no text."""
+    page = await fetch_page(PDF_URL.format(versioned_id), browser_client, timeout=httpx.Timeout(timeout),
+                            byte_range=pdf_engine.range_bytes)
+    if page is None:
+        return ""
+    text = await pdf_engine.extract(page.content, max_chars)
+    if not text.strip() and page.partial and pdf_engine.range_bytes:
+        page = await fetch_page(PDF_URL.format(versioned_id), browser_client, timeout=httpx.Timeout(timeout))
+        text = await pdf_engine.extract(page.content, max_chars) if page else ""
+    return text
+
+
+if __name__ == "__main__":
+    import sys
+
+    client = httpx.AsyncClient(follow_redirects=True)
+    url = sys.argv[1] if len(sys.argv) > 1 else "https://arxiv.org/abs/1706.03762"
+    arxiv_id, version = parse_arxiv_url(url)
+    meta = asyncio.run(fetch_arxiv_metadata(arxiv_id, version, client))
+    print(format_metadata(arxiv_id, meta) if meta else "not found")
@@ -0,0 +1,274 @@
+import re
+import sys
+from typing import List, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit, parse_qs
+import httpx
+from lxml import etree
+from lxml.html import HtmlElementClassLookup
+from src.utils.cache import TTLByteLRUCache
+from src.utils.tokenizer import estimate_tokens
+
+# Parsoid HTML of the current revision; the ETag is W/"<revision id>/<render id>"
+REST_HTML_URL = "https://{host}/api/rest_v1/page/html/{title}"
+ETAG_REVISION = re.compile(r'"(\d+)/')
+WIKI_HOST = re.compile(r"^([a-z\-]+)\.(?:m\.)?wikipedia\.org$")
+# non-article namespaces (en / ko / ja); their pages go through the generic converter
+NAMESPACES = {
+    "special", "wikipedia", "file", "category", "template", "help", "portal", "talk", "user",
+    "특수", "위키백과", "파일", "분류", "틀", "도움말", "포털", "토론", "사용자",
+    "特別", "ファイル", "カテゴリ", "ノート", "利用者",
+}
+
+# sections that are not article text (ko / en / ja headings)
+SKIPPED_SECTIONS = {
+    "각주", "참고 문헌", "참고문헌", "외부 링크", "같이 보기", "출처", "내용주",
+    "references", "external links", "see also", "notes", "further reading", "bibliography", "sources", "citations",
+    "脚注", "参考文献", "関連項目", "外部リンク",
+}
+# removed before the text of a section is read
+REMOVED = etree.XPath(
+    "descendant::*[self::style or self::script or self::figure"
+    # reference marks only: other <sup> are exponents and units (km², 10⁶)
+    " or (self::sup and (contains(concat(' ', normalize-space(@class), ' '), ' reference ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' mw-ref ')))"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' navbox ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' reflist ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' references ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' mw-editsection ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' noprint ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' metadata ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' hatnote ')]"
+)
+BLOCK_TAGS = {"h2", "h3", "h4", "h5", "h6", "p", "ul", "ol", "dl", "table", "blockquote"}
+SPACES = re.compile(r"\s+")
+
+
+def parse_wiki_url(url: str) -> Optional[Tuple[str, str]]:
+    """(desktop host, article title) of a Wikipedia article URL, None for other pages."""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return None
+    match = WIKI_HOST.match((parts.hostname or "").lower())
+    if not match:
+        return None
+    if parts.path.startswith("/wiki/"):
+        title = unquote(parts.path[len("/wiki/"):])
+    else:
+        title = parse_qs(parts.query).get("title", [""])[0]
+    if not title or title.partition(":")[0].lower() in NAMESPACES:
+        return None
+    return f"{match.group(1)}.wikipedia.org", title.replace(" ", "_")
+
+
+def _text(element) -> str:
+    return SPACES.sub(" ", element.text_content()).strip()
+
+
+def table_to_markdown(table) -> str:
+    """Markdown of a wikitable (colspans repeated, rowspans left empty), without pandas."""
+    rows: List[List[str]] = []
+    for tr in table.iter("tr"):
+        row = []
+        for cell in tr:
+            if cell.tag not in ("th", "td"):
+                continue
+            text = _text(cell).replace("|", "\\|")
+            span = cell.get("colspan", "1")
+            row.extend([text] * (int(span) if span.isdigit() and 0 < int(span) < 50 else 1))
+        if row:
+            rows.append(row)
+    if not rows:
+        return ""
+    width = max(len(row) for row in rows)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    lines = ["| " + " | ".join(rows[0]) + " |", "|" + " --- |" * width]
+    lines.extend("| " + " | ".join(row) + " |" for row in rows[1:])
+    return "\n".join(lines)
+
+
+def infobox_to_text(table) -> str:
+    lines = []
+    for tr in table.iter("tr"):
+        header, value = tr.find("th"), tr.find("td")
+        if header is not None and value is not None:
+            lines.append(f"- {_text(header)}: {_text(value)}")
+    return "\n".join(lines)
+
+
+def section_blocks(section) -> List[str]:
+    """Markdown blocks of a top-level Parsoid `<section>` and its subsections, in order."""
+    for removed in REMOVED(section):
+        removed.drop_tree()
+    blocks = []
+    for element in section.iter():
+        if element.tag not in BLOCK_TAGS:
+            continue
+        # a block inside another block was read with its container
+        if any(ancestor.tag in BLOCK_TAGS for ancestor in element.iterancestors()):
+            continue
+        classes = (element.get("class") or "").split()
+        if element.tag == "table":
+            if "infobox" in classes:
+                text = infobox_to_text(element)
+            elif "wikitable" in classes:
+                text = table_to_markdown(element)
+            else:
+                continue
+        elif element.tag in ("ul", "ol"):
+            text = "\n".join(f"- {_text(item)}" for item in element.iterchildren("li") if _text(item))
+        elif element.tag[0] == "h":
+            text = _text(element)
+            text = f"{'#' * int(element.tag[1])} {text}" if text else ""
+        else:
+            text = _text(element)
+        if text:
+            blocks.append(text)
+    return blocks
+
+
+def _heading(section) -> str:
+    heading = next((child for child in section if child.tag in ("h2", "h3", "h4")), None)
+    return _text(heading).lower() if heading is not None else ""
+
+
+class WikipediaEngine:
+    """Wikipedia articles from the REST API's Parsoid HTML, read section by section.
+
+    The HTML is streamed into an incremental lxml parser and every top-level
+    `<section>` is converted as soon as it is complete; reference/link sections are
+    skipped and the download stops once `max_tokens` is reached, so a long article
+    costs about what its first screens do. Results are cached per process by
+    revision id: the ETag of the answer names the revision, so a cached revision
+    is served without reading the body, and a title is remembered for
+    `revision_ttl` seconds without asking at all.
+
+    Parameters
+    ----------
+    max_tokens : int
+        Budget of the extracted text (estimated tokens).
+    timeout : float
+        Seconds per article request.
+    cache_bytes : int
+        Size of the article cache.
+    revision_ttl : float
+        Seconds a title keeps resolving to the revision seen last.
+    """
+
+    def __init__(self, max_tokens: int = 6000, timeout: float = 3.0, cache_bytes: int = 16 * 1024 * 1024,
+                 revision_ttl: float = 600):
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.revision_ttl = revision_ttl
+        self.cache = TTLByteLRUCache(max_bytes=cache_bytes)
+        self.sections_read = 0
+        self.sections_skipped = 0
+        self.truncated = 0
+
+    def _cache_article(self, host: str, title: str, revision: Optional[str], content: str) -> None:
+        if revision is None:
+            return
+        self.cache.set((host, revision), content, size=sys.getsizeof(content))
+        self.cache.set(("title", host, title), revision, ttl=self.revision_ttl, size=128)
+
+    async def extract(self, url: str, browser_client) -> Optional[str]:
+        """Markdown of the article at *url* ("" if missing); None if *url* is not an article."""
+        parsed = parse_wiki_url(url)
+        if parsed is None:
+            return None
+        host, title = parsed
+        revision = self.cache.get(("title", host, title))
+        if revision is not None and (cached := self.cache.get((host, revision))) is not None:
+            return cached
+
+        request_url = REST_HTML_URL.format(host=host, title=quote(title, safe=""))
+        async with browser_client.stream("GET", request_url, timeout=httpx.Timeout(self.timeout),
+                                         follow_redirects=True) as response:
+            if response.status_code != 200:
+                return ""
+            match = ETAG_REVISION.search(response.headers.get("etag", ""))
+            revision = match.group(1) if match else None
+            if revision is not None and (cached := self.cache.get((host, revision))) is not None:
+                self.cache.set(("title", host, title), revision, ttl=self.revision_ttl, size=128)
+                return cached
+
+            parser = etree.HTMLPullParser(events=("end",), tag="section", encoding="utf-8")
+            # lxml.html elements (text_content / drop_tree)
+            parser.set_element_class_lookup(HtmlElementClassLookup())
+            blocks, tokens, page_title, complete = [], 0, "", True
+            async for chunk in response.aiter_bytes():
+                parser.feed(chunk)
+                for _, section in parser.read_events():
+                    if section.getparent() is None or section.getparent().tag != "body":
+                        continue  # subsections are read with their top-level section
+                    if not page_title:
+                        page_title = section.getroottree().findtext(".//title") or title.replace("_", " ")
+                    if _heading(section) in SKIPPED_SECTIONS:
+                        self.sections_skipped += 1
+                    else:
+                        self.sections_read += 1
+                        for block in section_blocks(section):
+                            blocks.append(block)
+                            tokens += estimate_tokens(block)
+                            if tokens >= self.max_tokens:
+                                break
+                    section.clear()
+                    if tokens >= self.max_tokens:
+                        complete = False
+                        break
+                if not complete:
+                    self.truncated += 1
+                    break
+
+        if not blocks:
+            return ""
+        content = f"# {page_title}\n\n" + "\n\n".join(blocks)
+        self._cache_article(host, title, revision, content)
+        return content
+
+    def stats(self) -> dict:
+        return {"sections_read": self.sections_read, "sections_skipped": self.sections_skipped,
+                "truncated": self.truncated, "cache": self.cache.stats()}
+
+
+if __name__ == "__main__":
+    # benchmark: python -m src.converter.medias.wiki.engine
+    import time
+    import asyncio
+    from src.converter.medias.wiki.url2md_async import async_extract_wiki_content
+
+    paragraph = "<p>서울은 대한민국의 수도이며 최대 도시이다. " + "인구와 경제, 문화의 중심지로서 다양한 기능을 한다. " * 6 + "<sup class='reference'>[1]</sup></p>"
+    table = ("<table class='wikitable'><tr><th>구</th><th>인구</th><th>면적</th></tr>"
+             + "".join(f"<tr><td>구 {i}</td><td>{i * 1000}</td><td>{i}.5</td></tr>" for i in range(30)) + "</table>")
+    sections = "".join(f"<section data-mw-section-id='{i}'><h2 id='s{i}'>절 {i}</h2>{paragraph * 12}{table}"
+                       f"<section data-mw-section-id='{i}00'><h3>소절 {i}</h3>{paragraph * 4}</section></section>"
+                       for i in range(1, 60))
+    parsoid = (f"<!DOCTYPE html><html><head><title>서울특별시</title></head><body>"
+               f"<section data-mw-section-id='0'>{paragraph * 3}</section>{sections}"
+               f"<section data-mw-section-id='99'><h2>각주</h2><ol class='references'><li>ref</li></ol></section>"
+               f"</body></html>").encode()
+    legacy = (f"<html><body><h1 id='firstHeading'>서울특별시</h1><div id='mw-content-text'>"
+              f"{parsoid.decode()}</div></body></html>").encode()
+    print(f"article: {len(parsoid) // 1024} KB")
+
+    def handler(request):
+        if "/api/rest_v1/" in request.url.path:
+            return httpx.Response(200, content=parsoid, headers={"etag": 'W/"123456/abc"', "content-type": "text/html"})
+        return httpx.Response(200, content=legacy, headers={"content-type": "text/html"})
+
+    async def main():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        url = "https://ko.wikipedia.org/wiki/서울특별시"
+        start = time.perf_counter()
+        former = await async_extract_wiki_content(url, client)
+        print(f"former (pandas + html2text)  {(time.perf_counter() - start) * 1000:8.1f} ms  chars={len(former)}")
+        for max_tokens in (6000, 10 ** 9):
+            engine = WikipediaEngine(max_tokens=max_tokens)
+            start = time.perf_counter()
+            content = await engine.extract(url, client)
+            print(f"engine max_tokens={max_tokens:<10d} {(time.perf_counter() - start) * 1000:8.1f} ms  chars={len(content)}")
+            start = time.perf_counter()
+            await engine.extract(url, client)
+            print(f"engine (cached revision)     {(time.perf_counter() - start) * 1000:8.1f} ms  {engine.stats()['cache']['hits']} hits")
+
+    asyncio.run(main())
@@ -22,7 +22,7 @@ async def async_extract_wikipedia_content(url, browser_client):
     try:
         # 페이지 요청
         response = await browser_client.get(url)
-        if response.status != 200:
+        if response.status_code != 200:
             return ""
         # BeautifulSoup 객체 생성
         soup = BeautifulSoup(response.text, 'html.parser')
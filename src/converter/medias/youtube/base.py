@@ -1,6 +1,7 @@
 import re
-import asyncio
+from typing import List, Optional, Sequence, Tuple
 from youtube_transcript_api import YouTubeTranscriptApi
+from src.utils.tokenizer import tokenize
 
 
 def format_time(seconds_float):
@@ -52,39 +53,93 @@ def get_video_id(url: str) -> str:
     return regex_search(r"(?:v=|\/)([0-9A-Za-z_-]{11}).*", url, group=1)
 
 
-async def get_transcript(video_id: str) -> str:
-    result = ""
+# transcript languages, most preferred first
+LANGUAGES = ("ko", "en", "ja", "zh-Hans")
+# a segment runs to the next "[hh:mm:ss - " header: caption text may span lines
+SEGMENT_LINE = re.compile(r"^\[(\d+):(\d{2}):(\d{2}) - (\d+):(\d{2}):(\d{2})\]: (.*?)(?=\n\[\d+:\d{2}:\d{2} - |\n*\Z)",
+                          re.MULTILINE | re.DOTALL)
+
+# (start seconds, end seconds, text)
+Segment = Tuple[float, float, str]
+
+
+def fetch_segments(video_id: str, languages: Sequence[str] = LANGUAGES) -> Tuple[str, List[Segment]]:
+    """(language code, segments) of a video's transcript; a manually created transcript
+    is preferred over a generated one. Blocking (HTTP); raises when there is none."""
+    transcript_list = YouTubeTranscriptApi().list(video_id)
     try:
-        ytt_api = YouTubeTranscriptApi()
-        transcript_list = ytt_api.list(video_id)
-
-        try:
-            transcript = transcript_list.find_manually_created_transcript(['ko', 'en', 'ja', 'zh-Hans'])  
-            response = transcript.fetch()
-        except Exception as e:
-            try:
-                transcript = transcript_list.find_generated_transcript(['ko', 'en', 'ja', 'zh-Hans'])
-                response = transcript.fetch()
-            except Exception as e:
-                result = f"Error: {e}"
-                return result
-        
-        result = "### Transcript\n"
-        for chunk in response:
-            start_time = chunk.start
-            end_time = start_time + chunk.duration
-            text = chunk.text
-            
-            start_time_formatted = format_time(start_time)
-            end_time_formatted = format_time(end_time)
-            result += f"[{start_time_formatted} - {end_time_formatted}]: {text}\n"
-        return result
-    except Exception as e:
-        result = f"Error: {e}"
-        return result
+        transcript = transcript_list.find_manually_created_transcript(languages)
+        chunks = transcript.fetch()
+    except Exception:
+        # no manual transcript, or one that is listed but fails to download
+        transcript = transcript_list.find_generated_transcript(languages)
+        chunks = transcript.fetch()
+    segments = [(chunk.start, chunk.start + chunk.duration, chunk.text) for chunk in chunks]
+    return transcript.language_code, segments
+
+
+def format_transcript(segments: Sequence[Segment]) -> str:
+    lines = ["### Transcript"]
+    lines.extend(f"[{format_time(start)} - {format_time(end)}]: {text}" for start, end, text in segments)
+    return "\n".join(lines) + "\n"
+
+
+def parse_transcript(content: str) -> List[Segment]:
+    """Segments of a `format_transcript` text (e.g. a transcript served from the crawl cache)."""
+    segments = []
+    for match in SEGMENT_LINE.finditer(content):
+        h1, m1, s1, h2, m2, s2, text = match.groups()
+        segments.append((int(h1) * 3600 + int(m1) * 60 + int(s1), int(h2) * 3600 + int(m2) * 60 + int(s2), text))
+    return segments
+
+
+def select_relevant_segments(segments: Sequence[Segment], queries: Sequence[str], max_segments: int = 40,
+                             context: int = 1) -> List[Optional[Segment]]:
+    """The segments sharing the most terms with *queries*, each with *context* neighbours
+    on both sides, in time order; None marks a gap between kept runs.
+
+    Returns every segment when the transcript is not longer than *max_segments*, and
+    the opening segments when nothing matches.
+    """
+    if len(segments) <= max_segments:
+        return list(segments)
+    query_terms = set()
+    for query in queries:
+        query_terms.update(tokenize(query))
+    scores = [len(query_terms.intersection(tokenize(text))) for _, _, text in segments]
+
+    keep = set()
+    for index in sorted(range(len(segments)), key=lambda i: scores[i], reverse=True):
+        if scores[index] == 0 or len(keep) >= max_segments:
+            break
+        keep.update(range(max(index - context, 0), min(index + context + 1, len(segments))))
+    if not keep:
+        keep = set(range(max_segments))
+
+    selected, previous = [], None
+    for index in sorted(keep):
+        if previous is not None and index != previous + 1:
+            selected.append(None)
+        selected.append(segments[index])
+        previous = index
+    return selected
+
+
+def focus_transcript(content: str, queries: Sequence[str], max_segments: int = 40, context: int = 1) -> str:
+    """Only the query-relevant segments of a formatted transcript ("..." between runs)."""
+    segments = parse_transcript(content)
+    if len(segments) <= max_segments:
+        return content
+    lines = ["### Transcript"]
+    for segment in select_relevant_segments(segments, queries, max_segments, context):
+        if segment is None:
+            lines.append("...")
+        else:
+            start, end, text = segment
+            lines.append(f"[{format_time(start)} - {format_time(end)}]: {text}")
+    return "\n".join(lines) + "\n"
 
 
 if __name__ == "__main__":
-    import asyncio
     video_id = get_video_id("https://www.youtube.com/watch?v=A1S19JzHN2M")
-    print(asyncio.run(get_transcript(video_id)))
\ No newline at end of file
+    print(format_transcript(fetch_segments(video_id)[1]))
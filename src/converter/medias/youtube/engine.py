@@ -0,0 +1,123 @@
+import sys
+import asyncio
+from typing import Optional, Sequence
+from rich.console import Console
+from src.utils.cache import TTLByteLRUCache
+from src.utils.single_flight import SingleFlight
+from .base import LANGUAGES, fetch_segments, format_transcript
+
+console = Console()
+
+
+class TranscriptEngine:
+    """Fetches YouTube transcripts off the event loop.
+
+    `youtube_transcript_api` is blocking (requests); each fetch runs in a thread,
+    at most `max_concurrency` at a time, so several videos of one query are fetched
+    in parallel without starving the loop or the default thread pool. Transcripts
+    are cached per process by (video id, language preference); concurrent requests
+    for the same video share one fetch.
+
+    Parameters
+    ----------
+    max_concurrency : int
+        Transcript fetches running at once (per uvicorn worker).
+    timeout : float
+        Seconds per transcript; "" on timeout.
+    languages : sequence of str
+        Transcript languages, most preferred first.
+    cache_bytes : int
+        Size of the transcript cache.
+    ttl : float
+        Seconds a cached transcript is served.
+    """
+
+    def __init__(self, max_concurrency: int = 4, timeout: float = 5.0, languages: Sequence[str] = LANGUAGES,
+                 cache_bytes: int = 8 * 1024 * 1024, ttl: float = 24 * 3600):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.languages = tuple(languages)
+        self.ttl = ttl
+        self.cache = TTLByteLRUCache(max_bytes=cache_bytes)
+        self.single_flight = SingleFlight()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.timeouts = 0
+        self.failures = 0
+
+    def _key(self, video_id: str):
+        return video_id, ",".join(self.languages)
+
+    async def _fetch(self, video_id: str) -> str:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            try:
+                _, segments = await asyncio.wait_for(asyncio.to_thread(fetch_segments, video_id, self.languages),
+                                                     timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                console.log(f"[red]YouTube: transcript of {video_id} timed out")
+                return ""
+            except Exception as e:
+                # no transcript in the requested languages, video unavailable, blocked IP, ...
+                self.failures += 1
+                console.log(f"[red]YouTube: no transcript for {video_id}: {type(e).__name__}")
+                return ""
+        content = format_transcript(segments)
+        self.cache.set(self._key(video_id), content, ttl=self.ttl, size=sys.getsizeof(content))
+        return content
+
+    async def get(self, video_id: str) -> str:
+        """Formatted transcript of *video_id* ("" if it has none)."""
+        if not video_id:
+            return ""
+        cached = self.cache.get(self._key(video_id))
+        if cached is not None:
+            return cached
+        return await self.single_flight.do(self._key(video_id), lambda: self._fetch(video_id))
+
+    def stats(self) -> dict:
+        return {"max_concurrency": self.max_concurrency, "timeouts": self.timeouts, "failures": self.failures,
+                "cache": self.cache.stats()}
+
+
+if __name__ == "__main__":
+    # benchmark: python -m src.converter.medias.youtube.engine
+    # blocking fetch simulated with a sleep, one query with 6 videos (two of them the same)
+    import time
+
+    def fake_fetch(video_id, languages=LANGUAGES):
+        time.sleep(0.3)
+        return "en", [(i * 4.0, i * 4.0 + 4.0, f"{video_id} segment {i}") for i in range(600)]
+
+    fetch_segments = fake_fetch
+    video_ids = ["a" * 11, "b" * 11, "c" * 11, "d" * 11, "a" * 11, "b" * 11]
+
+    async def former():
+        # former get_transcript: blocking calls on the loop, string +=
+        results = []
+        for video_id in video_ids:
+            _, segments = fake_fetch(video_id)
+            result = "### Transcript\n"
+            for start, end, text in segments:
+                result += f"[{start} - {end}]: {text}\n"
+            results.append(result)
+        return results
+
+    async def engine_run(engine):
+        return await asyncio.gather(*(engine.get(video_id) for video_id in video_ids))
+
+    async def main():
+        start = time.perf_counter()
+        await former()
+        print(f"former (serial, on the loop) {time.perf_counter() - start:6.2f} s")
+        engine = TranscriptEngine(max_concurrency=4)
+        start = time.perf_counter()
+        await engine_run(engine)
+        print(f"engine (cold)                {time.perf_counter() - start:6.2f} s")
+        start = time.perf_counter()
+        await engine_run(engine)
+        print(f"engine (cached)              {time.perf_counter() - start:6.2f} s")
+        print(engine.stats())
+
+    asyncio.run(main())
@@ -1,13 +1,12 @@
-from bs4 import BeautifulSoup
+from src.converter import FetchedPage
 import re
 import json
 
-async def async_extract_chosun_news_content(url, browser_client):
+def extract_chosun_news_content(page: FetchedPage) -> str:
+    # fusion-metadata 스크립트가 없으면 빈 문자열
+    result = ""
     try:
-        response = await browser_client.get(url)
-        if response.status_code != 200:
-            return ""
-        html = BeautifulSoup(response.text, "html.parser")
+        html = page.soup
 
         # 방법 1: fusion-metadata에서 JSON 데이터 추출
         fusion_script = html.find("script", {"id": "fusion-metadata"})
@@ -25,7 +24,6 @@ async def async_extract_chosun_news_content(url, browser_client):
                     content_data = {}
                     # 마지막 완전한 객체까지만 추출
                     last_complete_brace = json_str.rfind('}')
-                    print(last_complete_brace)
                     if last_complete_brace != -1:
                         # 마지막 }부터 끝까지 확인해서 완전한 JSON 구조 찾기
                         for i in range(last_complete_brace, -1, -1):
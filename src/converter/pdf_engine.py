@@ -0,0 +1,162 @@
+import os
+import time
+import asyncio
+from typing import Optional
+from urllib.parse import urlsplit
+from structlog import get_logger
+from src.utils.process_pool import WarmProcessPool
+
+logger = get_logger(__name__)
+
+
+def looks_like_pdf(url: str) -> bool:
+    """URL that most likely serves a PDF (worth a Range request for its leading bytes)."""
+    try:
+        path = urlsplit(url).path.lower()
+    except ValueError:
+        return False
+    return path.endswith(".pdf") or "/pdf/" in path
+
+
+def extract_pdf_text(pdf_bytes: bytes, max_chars: int = 20000, max_pages: int = 10,
+                     time_limit: Optional[float] = None) -> str:
+    """Text of the leading pages of a PDF, page by page, stopping at *max_chars*,
+    *max_pages* or *time_limit* seconds (whichever comes first).
+
+    A truncated document (from a Range request) is opened in MuPDF's repair mode;
+    the text of the pages that could be read is returned, "" if none.
+    """
+    import fitz
+    # repair warnings of truncated documents are expected
+    fitz.TOOLS.mupdf_display_errors(False)
+
+    deadline = time.monotonic() + time_limit if time_limit else None
+    parts, total = [], 0
+    try:
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            for index in range(min(max_pages, doc.page_count)):
+                text = doc[index].get_text()
+                parts.append(text)
+                total += len(text)
+                if total >= max_chars or (deadline is not None and time.monotonic() > deadline):
+                    break
+    except Exception as e:
+        # a truncated or damaged document: keep the pages read so far, but say why it stopped
+        logger.warning("pdf_extract_failed", error=f"{type(e).__name__}: {e}", pages_read=len(parts))
+    return "".join(parts)[:max_chars]
+
+
+def _warm_up(_: int = 0) -> int:
+    # import fitz once per worker so the first document is not slow
+    import fitz  # noqa: F401
+    return os.getpid()
+
+
+class PdfExtractionEngine:
+    """Runs `extract_pdf_text` off the event loop, in worker processes or threads.
+
+    In process mode a pathological PDF occupies a worker process instead of a
+    thread of the server. The page loop stops itself at `timeout` between pages;
+    a document still running when `timeout` expires (one slow page) gets its
+    worker processes terminated and the pool rebuilt, so it cannot pin the pool.
+
+    Parameters
+    ----------
+    mode : str
+        "process" (warm ProcessPoolExecutor) or "thread" (`asyncio.to_thread`).
+    max_workers : int
+        Worker processes.
+    timeout : float
+        Seconds per document; "" on timeout.
+    max_pages : int
+        Pages read at most (the char budget usually stops earlier).
+    range_bytes : int, optional
+        Size of the leading slice requested with `Range` for PDF URLs (None: always full download).
+    """
+
+    def __init__(self, mode: str = "thread", max_workers: int = 1, timeout: float = 1.5, max_pages: int = 10,
+                 range_bytes: Optional[int] = None):
+        if mode not in ("process", "thread"):
+            raise ValueError(f"Invalid pdf extraction mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.range_bytes = range_bytes
+        self._pool = WarmProcessPool("pdf_engine", max_workers, _warm_up)
+        self._recycling: Optional[asyncio.Future] = None
+        self.timeouts = 0
+        self.range_hits = 0
+        self.range_misses = 0
+
+    def start(self) -> None:
+        """Spawn and warm the worker processes (no-op in thread mode)."""
+        if self.mode != "process":
+            return
+        self._pool.start()
+        logger.info("pdf_engine_started", mode=self.mode, workers=self.max_workers)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
+
+    async def extract(self, pdf_bytes: bytes, max_chars: int) -> str:
+        submitted = []
+        if self.mode == "process":
+            # a dead worker (e.g. MuPDF crash or OOM) gives "" and one rebuild, off the loop
+            extraction = self._pool.run(extract_pdf_text, pdf_bytes, max_chars, self.max_pages, self.timeout,
+                                        default="", on_submit=submitted.append)
+        else:
+            extraction = asyncio.to_thread(extract_pdf_text, pdf_bytes, max_chars, self.max_pages, self.timeout)
+        try:
+            return await asyncio.wait_for(extraction, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            if submitted:
+                # the document keeps running in its worker otherwise; replace the workers
+                # in the background (this caller is already late)
+                self._recycling = asyncio.ensure_future(self._pool.rebuild(submitted[0], terminate=True))
+                self._recycling.add_done_callback(self._recycled)
+            return ""
+
+    @staticmethod
+    def _recycled(task: asyncio.Future) -> None:
+        # nobody awaits the background rebuild: retrieve and log its failure here
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("pdf_engine_rebuild_failed", error=repr(task.exception()))
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "workers": self.max_workers if self.mode == "process" else None,
+                "timeouts": self.timeouts, "pool_rebuilds": self._pool.rebuilds, "range_hits": self.range_hits,
+                "range_misses": self.range_misses}
+
+
+if __name__ == "__main__":
+    # benchmark: python -m src.converter.pdf_engine
+    import fitz
+
+    doc = fitz.open()
+    for page_number in range(200):
+        page = doc.new_page()
+        for line in range(45):
+            page.insert_text((50, 50 + line * 16), f"page {page_number} line {line}: " + "lorem ipsum dolor sit amet " * 2,
+                             fontsize=9)
+    pdf_bytes = doc.tobytes()
+    print(f"document: {len(pdf_bytes) // 1024} KB, {doc.page_count} pages")
+
+    def former(data: bytes) -> str:
+        # former Crawler.extract_pdf_text: first 10 pages, no char budget
+        with fitz.open(stream=data, filetype="pdf") as pdf:
+            return "".join(pdf[i].get_text() for i in range(min(10, len(pdf))))
+
+    for name, run in (("former (10 pages)", lambda: former(pdf_bytes)),
+                      ("budget 20000 chars", lambda: extract_pdf_text(pdf_bytes, 20000, 10)),
+                      ("budget 60000 chars", lambda: extract_pdf_text(pdf_bytes, 60000, 10))):
+        start = time.perf_counter()
+        for _ in range(5):
+            text = run()
+        print(f"{name:20s} {(time.perf_counter() - start) / 5 * 1000:7.1f} ms  chars={len(text)}")
+
+    for fraction in (0.05, 0.1, 0.25):
+        head = pdf_bytes[:int(len(pdf_bytes) * fraction)]
+        text = extract_pdf_text(head, 20000, 10)
+        print(f"leading {fraction:4.0%} ({len(head) // 1024:5d} KB): chars={len(text)}")
@@ -0,0 +1,335 @@
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/124.0.0.0 Safari/537.36")
+
+# time.monotonic() by which the current crawl gives up (set by Crawler.multiple_crawl for
+# its crawl tasks): a render never waits or loads past it
+RENDER_DEADLINE: ContextVar[Optional[float]] = ContextVar("render_deadline", default=None)
+
+
+class Renderer:
+    """Backend of `RenderService`: opens browser sessions and renders a URL in one.
+
+    Methods are blocking; the service calls them from its own threads, one session
+    per thread at a time.
+    """
+
+    def open(self) -> Any:
+        raise NotImplementedError
+
+    def render(self, session: Any, url: str, timeout: float) -> Optional[str]:
+        """HTML of *url* after scripts ran (None if it could not be loaded)."""
+        raise NotImplementedError
+
+    def close(self, session: Any) -> None:
+        pass
+
+
+class SeleniumRenderer(Renderer):
+    """Headless Chrome through Selenium (images off, no sandbox)."""
+
+    def open(self) -> Any:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        options = Options()
+        for argument in ("--headless=new", "--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu",
+                         "--disable-extensions", f"--user-agent={USER_AGENT}"):
+            options.add_argument(argument)
+        options.add_experimental_option("prefs", {
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.managed_default_content_settings.images": 2,
+        })
+        # DOMContentLoaded is enough for the article text; do not wait for every subresource
+        options.page_load_strategy = "eager"
+        return webdriver.Chrome(options=options)
+
+    def render(self, session: Any, url: str, timeout: float) -> Optional[str]:
+        session.set_page_load_timeout(timeout)
+        session.get(url)
+        return session.page_source
+
+    def close(self, session: Any) -> None:
+        session.quit()
+
+
+class CallableRenderer(Renderer):
+    """Renders with a plain function `url -> html` (no browser): local fakes for
+    tests and benchmarks, or a remote rendering endpoint."""
+
+    def __init__(self, render_fn: Callable[[str], Optional[str]]):
+        self.render_fn = render_fn
+
+    def open(self) -> Any:
+        return object()
+
+    def render(self, session: Any, url: str, timeout: float) -> Optional[str]:
+        return self.render_fn(url)
+
+
+RENDERERS = {"selenium": SeleniumRenderer}
+
+
+class _Session:
+    def __init__(self, handle: Any):
+        self.handle = handle
+        self.pages = 0
+
+
+class RenderService:
+    """A warm pool of headless browser sessions behind a "render this URL" API.
+
+    Sessions are opened on the first renders (or by `start`) and reused; a session is closed
+    and replaced after `max_pages_per_session` renders (or a failed one), which
+    bounds the memory a long-lived browser accumulates. The close runs on a thread of
+    its own (quitting the browser also interrupts a page load stuck in the session's
+    thread) and the replacement opens in the background, so neither delays the caller. Each session is driven by
+    its own thread. At most `max_queue` renders wait for a free session; beyond
+    that `render` returns None at once, and a waiting render gives up after
+    `queue_timeout`, so a burst of JS-only pages cannot pile up behind the pool.
+    Waiting and page load are also cut at the crawl deadline (`RENDER_DEADLINE`), and
+    after a browser failed to open no session is opened for `open_cooldown` seconds
+    (renders return None meanwhile). State is process-local: one service (and its browsers) per uvicorn worker.
+
+    Parameters
+    ----------
+    renderer : str or Renderer
+        "selenium", or a `Renderer` instance (e.g. `CallableRenderer` for a fake).
+    sessions : int
+        Browser sessions per uvicorn worker.
+    max_pages_per_session : int
+        Renders before a session is recycled.
+    max_queue : int
+        Renders allowed to wait for a session.
+    queue_timeout : float
+        Seconds a render waits for a session.
+    timeout : float
+        Seconds per render (page load), at most the time left until the crawl deadline.
+    open_cooldown : float
+        Seconds without opening attempts after a session failed to open.
+    """
+
+    def __init__(self, renderer="selenium", sessions: int = 1, max_pages_per_session: int = 50,
+                 max_queue: int = 8, queue_timeout: float = 2.0, timeout: float = 3.0, open_cooldown: float = 60.0):
+        if isinstance(renderer, str):
+            if renderer not in RENDERERS:
+                raise ValueError(f"Invalid renderer: {renderer}")
+            renderer = RENDERERS[renderer]()
+        self.renderer = renderer
+        self.sessions = sessions
+        self.max_pages_per_session = max_pages_per_session
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self.open_cooldown = open_cooldown
+        self._open_retry_at = 0.0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._replacements = set()
+        self._idle: Optional[asyncio.Queue] = None
+        self._opened = 0
+        self._waiting = 0
+        self.renders = 0
+        self.failures = 0
+        self.rejected = 0
+        self.recycled = 0
+        self.open_failures = 0
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _ensure_pool(self) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.sessions, thread_name_prefix="render")
+            self._idle = asyncio.Queue()
+
+    async def _open_session(self) -> Optional[_Session]:
+        if time.monotonic() < self._open_retry_at:
+            return None
+        try:
+            return _Session(await self._run(self.renderer.open))
+        except Exception as e:
+            # e.g. no Chrome on this host: do not pay a failed browser start on every render
+            self.open_failures += 1
+            self._open_retry_at = time.monotonic() + self.open_cooldown
+            logger.error("render_session_open_failed", error=str(e), retry_in=self.open_cooldown)
+            return None
+
+    async def _close_session(self, session: _Session) -> None:
+        try:
+            await self._run(self.renderer.close, session.handle)
+        except Exception as e:
+            logger.warning("render_session_close_failed", error=str(e))
+
+    async def start(self) -> None:
+        """Open every session now instead of on the first renders."""
+        self._ensure_pool()
+        while self._opened < self.sessions:
+            self._opened += 1
+            session = await self._open_session()
+            if session is None:
+                self._opened -= 1
+                break
+            self._idle.put_nowait(session)
+        logger.info("render_service_started", sessions=self._opened)
+
+    async def shutdown(self) -> None:
+        if self._executor is None:
+            return
+        for replacement in list(self._replacements):
+            replacement.cancel()
+        while not self._idle.empty():
+            await self._close_session(self._idle.get_nowait())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = None
+        self._idle = None
+        self._opened = 0
+
+    async def _acquire(self, queue_timeout: float) -> Optional[_Session]:
+        if not self._idle.empty():
+            return self._idle.get_nowait()
+        if self._opened < self.sessions:
+            self._opened += 1
+            session = await self._open_session()
+            if session is None:
+                self._opened -= 1
+            return session
+        return await asyncio.wait_for(self._idle.get(), timeout=queue_timeout)
+
+    def _close_in_background(self, session: _Session) -> None:
+        # not on the executor: its thread may still be stuck in this session's page load
+        def close():
+            try:
+                self.renderer.close(session.handle)
+            except Exception as e:
+                logger.warning("render_session_close_failed", error=str(e))
+
+        threading.Thread(target=close, name="render-close", daemon=True).start()
+
+    async def _replace(self) -> None:
+        replacement = await self._open_session()
+        if replacement is None:
+            self._opened -= 1
+        else:
+            self._idle.put_nowait(replacement)
+
+    def _release(self, session: _Session, healthy: bool) -> None:
+        if self._idle is None:
+            # the service was shut down during this render
+            self._close_in_background(session)
+            return
+        if healthy and session.pages < self.max_pages_per_session:
+            self._idle.put_nowait(session)
+            return
+        # recycle: a fresh browser replaces this one (renders may be waiting for it)
+        self.recycled += 1
+        self._close_in_background(session)
+        replacement = asyncio.ensure_future(self._replace())
+        self._replacements.add(replacement)
+        replacement.add_done_callback(self._replacements.discard)
+
+    def _time_left(self, limit: float) -> float:
+        deadline = RENDER_DEADLINE.get()
+        return limit if deadline is None else min(limit, deadline - time.monotonic())
+
+    async def render(self, url: str) -> Optional[str]:
+        """HTML of *url* rendered by a pooled browser session; None when the queue is
+        full, no session freed up in time, or the page failed to load."""
+        self._ensure_pool()
+        if self._waiting >= self.max_queue or self._time_left(self.queue_timeout) <= 0:
+            self.rejected += 1
+            return None
+        self._waiting += 1
+        try:
+            session = await self._acquire(self._time_left(self.queue_timeout))
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            return None
+        finally:
+            self._waiting -= 1
+        if session is None:
+            self.failures += 1
+            return None
+
+        healthy = False
+        # a page still loading after the crawl gave up would only hold the session
+        timeout = max(self._time_left(self.timeout), 0.1)
+        # the browser's own page-load timeout fires first; this guard (hung driver) also
+        # ends at the crawl deadline
+        guard = max(self._time_left(self.timeout + 1.0), timeout)
+        try:
+            html = await asyncio.wait_for(self._run(self.renderer.render, session.handle, url, timeout),
+                                          timeout=guard)
+            healthy = True
+            self.renders += 1
+            return html
+        except Exception as e:
+            # a hung or crashed browser is not reused
+            self.failures += 1
+            logger.warning("render_failed", url=url, error=f"{type(e).__name__}: {e}")
+            return None
+        finally:
+            session.pages += 1
+            # synchronous: a cancelled caller still returns the session
+            self._release(session, healthy)
+
+    def stats(self) -> dict:
+        return {"sessions": self._opened, "idle": self._idle.qsize() if self._idle is not None else 0,
+                "waiting": self._waiting, "renders": self.renders, "failures": self.failures,
+                "rejected": self.rejected, "recycled": self.recycled, "open_failures": self.open_failures}
+
+
+if __name__ == "__main__":
+    # benchmark: python -m src.converter.render_service
+    # a fake browser: 1.5 s to start, 0.2 s per page (Selenium/Chrome is in that range)
+    import time
+
+    class FakeBrowser(Renderer):
+        def open(self):
+            time.sleep(1.5)
+            return object()
+
+        def render(self, session, url, timeout):
+            time.sleep(0.2)
+            return f"<html><body><p>{url}</p></body></html>"
+
+    urls = [f"https://brunch.co.kr/@writer/{i}" for i in range(12)]
+
+    def former():
+        # former AsyncBrunchScraper: a new browser per article
+        renderer = FakeBrowser()
+        for url in urls:
+            renderer.render(renderer.open(), url, 8.0)
+
+    async def pooled(service: RenderService):
+        return await asyncio.gather(*(service.render(url) for url in urls))
+
+    async def main():
+        start = time.perf_counter()
+        await asyncio.to_thread(former)
+        print(f"browser per article        {time.perf_counter() - start:6.2f} s")
+        service = RenderService(FakeBrowser(), sessions=2, max_pages_per_session=5, max_queue=16, queue_timeout=10.0)
+        start = time.perf_counter()
+        await service.start()
+        print(f"pool start (2 sessions)    {time.perf_counter() - start:6.2f} s")
+        start = time.perf_counter()
+        results = await pooled(service)
+        print(f"pooled, 12 articles        {time.perf_counter() - start:6.2f} s  ok={sum(r is not None for r in results)}")
+        print(service.stats())
+        small = RenderService(FakeBrowser(), sessions=1, max_queue=2, queue_timeout=10.0)
+        await small.start()
+        results = await pooled(small)
+        print(f"backpressure (queue 2)     ok={sum(r is not None for r in results)} {small.stats()}")
+        await service.shutdown()
+        await small.shutdown()
+
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit, urlunsplit
+import soupsieve
+from bs4.element import CData, NavigableString, TemplateString
+from . import ContentExtractor, FetchedPage
+
+# text node types read from a container; html.parser/lxml type the strings inside
+# <template> as TemplateString, which get_text() would otherwise skip
+TEXT_TYPES = (NavigableString, CData, TemplateString)
+BLANK_LINES = re.compile(r'\n\n+')
+FIRST_LINE = "first_line"
+
+RULE_KEYS = {"container", "all", "strip", "separator", "strip_strings", "collapse", "start_after", "cut_before",
+             "title", "encoding", "rewrite"}
+
+
+class RuleBasedExtractor(ContentExtractor):
+    """Site extractor driven by a declarative rule (configs/extractors.yaml).
+
+    Selectors are compiled once (soupsieve) when the extractor is built; `parse` runs
+    them against the page's shared DOM (`FetchedPage.soup`).
+
+    Parameters
+    ----------
+    domain : str
+        Site key; the host and its subdomains dispatch here (`ExtractorRegistry`).
+    rule : dict
+        container / all / strip / separator / strip_strings / collapse /
+        start_after / cut_before / title / encoding / rewrite (see extractors.yaml).
+    """
+
+    def __init__(self, domain: str, rule: Dict[str, Any]):
+        unknown = set(rule) - RULE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown extractor rule keys for {domain}: {sorted(unknown)}")
+        self.domain = domain
+        self.domains = (domain,)
+        containers = rule.get("container") or []
+        if isinstance(containers, str):
+            containers = [containers]
+        self.containers = [soupsieve.compile(selector) for selector in containers]
+        self.match_all = rule.get("all", False)
+        strip = rule.get("strip") or []
+        self.strip = soupsieve.compile(", ".join(strip)) if strip else None
+        self.separator = rule.get("separator", "")
+        self.strip_strings = rule.get("strip_strings", False)
+        self.collapse = rule.get("collapse", "\n")
+        self.start_after = rule.get("start_after")
+        self.cut_before = rule.get("cut_before")
+        title = rule.get("title")
+        self.title = soupsieve.compile(title) if title and title != FIRST_LINE else None
+        self.title_first_line = title is not None
+        self.encoding = rule.get("encoding")
+        self.rewrite = dict(rule.get("rewrite") or {})
+
+    def can_handle(self, url: str) -> bool:
+        return self.domain in url
+
+    def resolve_url(self, url: str) -> str:
+        if not self.rewrite:
+            return url
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        if host in self.rewrite:
+            netloc = parts.netloc.replace(host, self.rewrite[host], 1)
+            url = urlunsplit(parts._replace(netloc=netloc))
+        return url
+
+    def _select(self, soup) -> List:
+        if not self.containers:
+            return [soup]
+        for selector in self.containers:
+            if self.match_all:
+                elements = selector.select(soup)
+                if elements:
+                    return elements
+            else:
+                element = selector.select_one(soup)
+                if element is not None:
+                    return [element]
+        return []
+
+    def _text(self, element) -> str:
+        if self.strip is not None:
+            for removed in self.strip.select(element):
+                removed.decompose()
+        return element.get_text(self.separator, strip=self.strip_strings, types=TEXT_TYPES)
+
+    def parse(self, page: FetchedPage) -> str:
+        soup = page.soup
+        elements = self._select(soup)
+        if not elements:
+            return ""
+
+        if self.match_all:
+            text = "".join(self._text(element) + "\n" for element in elements)
+        else:
+            text = self._text(elements[0])
+        text = BLANK_LINES.sub(self.collapse, text)
+
+        title = ""
+        if self.title is not None:
+            element = self.title.select_one(soup)
+            title = element.get_text(strip=True) if element is not None else ""
+        if not title and self.title_first_line:
+            title = next((line.strip() for line in text.split("\n") if line.strip()), "")
+
+        if self.start_after:
+            index = text.find(self.start_after)
+            if index != -1:
+                text = text[index + len(self.start_after):]
+        if self.cut_before:
+            index = text.find(self.cut_before)
+            if index != -1:
+                text = text[:index]
+        text = text.strip()
+
+        return f"{title}\n{text}".strip() if title else text
+
+
+def compile_extractor_rules(rules: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, RuleBasedExtractor]:
+    """{domain: RuleBasedExtractor} for one section (news / blog) of extractors.yaml."""
+    return {domain: RuleBasedExtractor(domain, rule or {}) for domain, rule in (rules or {}).items()}
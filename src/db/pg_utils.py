@@ -1,10 +1,13 @@
+import json
 import asyncio
+import asyncpg
 import logging
+from contextlib import asynccontextmanager
 from sqlalchemy import create_engine, text, Column, String, DateTime, JSON
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.dialects.postgresql import TEXT
 from sqlalchemy.exc import SQLAlchemyError
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from configs.config import Settings
 import structlog
@@ -31,16 +34,37 @@ class CrawledData(Base):
     content = Column(TEXT, nullable=True) # 크롤링된 본문 내용
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # HTTP validators of the crawled response, used for conditional revalidation
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
     # 추가: Serper 결과의 다른 필드들을 저장하고 싶다면 JSON 타입 컬럼 활용 가능
     # serper_source_info = Column(JSON, nullable=True)
 
+class SearchCacheEntry(Base):
+    """Search engine responses keyed by engine + normalized payload (see src/search/engines/cache.py)."""
+    __tablename__ = "search_cache"
+
+    key = Column(String, primary_key=True)
+    results = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
 # 동기 엔진 (테이블 생성용)
 sync_engine = create_engine(db_settings.SYNC_DATABASE_URL)
 SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
 
+# create_all() does not add columns to an existing table (TODO: Alembic)
+MIGRATION_QUERIES = [
+    "ALTER TABLE crawled_data ADD COLUMN IF NOT EXISTS etag VARCHAR",
+    "ALTER TABLE crawled_data ADD COLUMN IF NOT EXISTS last_modified VARCHAR",
+]
+
 def create_pg_tables():
     try:
         Base.metadata.create_all(bind=sync_engine, checkfirst=True)
+        with sync_engine.begin() as conn:
+            for query in MIGRATION_QUERIES:
+                conn.execute(text(query))
         logger.info("PostgreSQL tables created successfully (if they didn't exist).")
     except SQLAlchemyError as e:
         logger.error(f"Error creating PostgreSQL tables: {e}")
@@ -48,9 +72,8 @@ def create_pg_tables():
         logger.error(f"An unexpected error occurred during table creation: {e}")
 
 
-# 비동기 PostgreSQL 연결 (asyncpg 사용)
-# 실제 애플리케이션에서는 FastAPI의 lifespan 이벤트를 사용하여 연결 풀을 관리하는 것이 좋음
-# 여기서는 단순화된 형태로 제공
+# 비동기 PostgreSQL 연결 (SQLAlchemy async session)
+# asyncpg 연결 풀은 아래 init_pg_pool / close_pg_pool 에서 FastAPI lifespan 으로 관리
 async def get_pg_connection():
     # import asyncpg # asyncpg 직접 사용 시
     # conn = await asyncpg.connect(db_settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql"))
@@ -63,19 +86,151 @@ async def get_pg_connection():
         yield session # FastAPI dependency injection 스타일
 
 
+DOCUMENT_COLUMNS = "url, title, snippet, image_url, date, language, type, pdf_url, content, updated_at, etag, last_modified"
+SELECT_DOCUMENT_QUERY = f"SELECT {DOCUMENT_COLUMNS} FROM crawled_data WHERE url = $1"
+SELECT_DOCUMENTS_QUERY = f"SELECT {DOCUMENT_COLUMNS} FROM crawled_data WHERE url = ANY($1::text[])"
+TOUCH_DOCUMENTS_QUERY = "UPDATE crawled_data SET updated_at = $2 WHERE url = ANY($1::text[])"
+
+# Prepare data for CrawledData model fields
+# Except for 'content', other fields are fetched from source, and content is filled with the result of crawling.
+# 'type' and 'language' are fetched from source, so we need to modify the crawl function.
+UPSERT_DOCUMENT_QUERY = """
+INSERT INTO crawled_data (url, title, snippet, image_url, date, language, type, pdf_url, content, created_at, updated_at, etag, last_modified)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+ON CONFLICT (url) DO UPDATE SET
+    title = EXCLUDED.title,
+    snippet = EXCLUDED.snippet,
+    image_url = EXCLUDED.image_url,
+    date = EXCLUDED.date,
+    language = EXCLUDED.language,
+    type = EXCLUDED.type,
+    pdf_url = EXCLUDED.pdf_url,
+    content = EXCLUDED.content,
+    updated_at = EXCLUDED.updated_at,
+    etag = EXCLUDED.etag,
+    last_modified = EXCLUDED.last_modified;
+"""
+
+# Bulk path: COPY rows into a session-local staging table, then merge them with a
+# single INSERT ... SELECT ... ON CONFLICT statement.
+STAGING_TABLE = "crawled_data_staging"
+BULK_COLUMNS = ["url", "title", "snippet", "image_url", "date", "language", "type", "pdf_url", "content", "created_at", "updated_at", "etag", "last_modified"]
+CREATE_STAGING_TABLE_QUERY = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (LIKE crawled_data INCLUDING DEFAULTS) ON COMMIT DELETE ROWS;
+"""
+BULK_UPSERT_QUERY = f"""
+INSERT INTO crawled_data ({", ".join(BULK_COLUMNS)})
+SELECT {", ".join(BULK_COLUMNS)} FROM {STAGING_TABLE}
+ON CONFLICT (url) DO UPDATE SET
+    title = EXCLUDED.title,
+    snippet = EXCLUDED.snippet,
+    image_url = EXCLUDED.image_url,
+    date = EXCLUDED.date,
+    language = EXCLUDED.language,
+    type = EXCLUDED.type,
+    pdf_url = EXCLUDED.pdf_url,
+    content = EXCLUDED.content,
+    updated_at = EXCLUDED.updated_at,
+    etag = EXCLUDED.etag,
+    last_modified = EXCLUDED.last_modified;
+"""
+
+# search results cached across workers (search_cache table)
+SELECT_SEARCH_CACHE_QUERY = "SELECT results FROM search_cache WHERE key = $1 AND expires_at > $2"
+UPSERT_SEARCH_CACHE_QUERY = """
+    INSERT INTO search_cache (key, results, created_at, expires_at)
+    VALUES ($1, $2::json, $3, $4)
+    ON CONFLICT (key) DO UPDATE SET
+        results = EXCLUDED.results,
+        created_at = EXCLUDED.created_at,
+        expires_at = EXCLUDED.expires_at
+"""
+DELETE_EXPIRED_SEARCH_CACHE_QUERY = "DELETE FROM search_cache WHERE expires_at <= $1"
+
+# asyncpg prepares every query on first use and keeps it in a per-connection
+# statement cache keyed on the query text. With pooled (long-lived) connections
+# the SELECT/UPSERT above are therefore parsed and planned once per connection,
+# and each later call is a single Bind/Execute round-trip.
+_pg_pool = None
+
+
+async def init_pg_pool():
+    """Create the app-scoped asyncpg pool (called from the FastAPI lifespan)."""
+    global _pg_pool
+    if _pg_pool is not None:
+        return _pg_pool
+    try:
+        _pg_pool = await asyncpg.create_pool(
+            dsn=db_settings.ASYNCPG_DSN,
+            min_size=db_settings.PG_POOL_MIN_SIZE,
+            max_size=db_settings.PG_POOL_MAX_SIZE,
+            command_timeout=db_settings.PG_COMMAND_TIMEOUT,
+            timeout=db_settings.PG_CONNECT_TIMEOUT,
+            max_inactive_connection_lifetime=db_settings.PG_MAX_INACTIVE_CONNECTION_LIFETIME,
+            statement_cache_size=db_settings.PG_STATEMENT_CACHE_SIZE,
+        )
+        logger.info(f"PostgreSQL pool created (min={db_settings.PG_POOL_MIN_SIZE}, max={db_settings.PG_POOL_MAX_SIZE})")
+    except Exception as e:
+        logger.error(f"Error creating PostgreSQL pool: {e}")
+        _pg_pool = None
+    return _pg_pool
+
+
+async def close_pg_pool():
+    global _pg_pool
+    if _pg_pool is not None:
+        pool, _pg_pool = _pg_pool, None
+        await pool.close()
+        logger.info("PostgreSQL pool closed.")
+
+
+@asynccontextmanager
+async def acquire_pg_connection():
+    """Yield a pooled connection, or a one-off connection when no pool was started (scripts)."""
+    if _pg_pool is not None:
+        async with _pg_pool.acquire(timeout=db_settings.PG_POOL_ACQUIRE_TIMEOUT) as conn:
+            yield conn
+        return
+
+    conn = await asyncpg.connect(db_settings.ASYNCPG_DSN, timeout=db_settings.PG_CONNECT_TIMEOUT)
+    try:
+        yield conn
+    finally:
+        await conn.close()
+
+
 async def get_document_from_pg(url: str) -> Optional[Dict[str, Any]]:
-    import asyncpg
-    conn = None
     try:
-        conn = await asyncpg.connect(db_settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql"))
-        row = await conn.fetchrow("SELECT url, title, snippet, image_url, date, language, type, pdf_url, content FROM crawled_data WHERE url = $1", url)
+        async with acquire_pg_connection() as conn:
+            row = await conn.fetchrow(SELECT_DOCUMENT_QUERY, url)
         return dict(row) if row else None
     except Exception as e:
         logger.error(f"Error fetching document from PostgreSQL for url {url}: {e}")
         return None
-    finally:
-        if conn:
-            await conn.close()
+
+async def get_documents_from_pg(urls: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Resolve every cached URL of a request in one round-trip. Returns {url: row} for hits only."""
+    urls = list(dict.fromkeys(url for url in urls if url))
+    if not urls:
+        return {}
+    try:
+        async with acquire_pg_connection() as conn:
+            rows = await conn.fetch(SELECT_DOCUMENTS_QUERY, urls)
+        return {row['url']: dict(row) for row in rows}
+    except Exception as e:
+        logger.error(f"Error fetching {len(urls)} documents from PostgreSQL: {e}")
+        return {}
+
+async def touch_documents_in_pg(urls: List[str]):
+    """Mark cached documents as fresh again (e.g. after a 304 Not Modified) without rewriting content."""
+    urls = list(dict.fromkeys(url for url in urls if url))
+    if not urls:
+        return
+    try:
+        async with acquire_pg_connection() as conn:
+            await conn.execute(TOUCH_DOCUMENTS_QUERY, urls, datetime.utcnow())
+    except Exception as e:
+        logger.error(f"Error refreshing {len(urls)} documents in PostgreSQL: {e}")
 
 async def save_document_to_pg(data: Dict[str, Any]):
     # Add URL filtering logic
@@ -89,42 +244,21 @@ async def save_document_to_pg(data: Dict[str, Any]):
     if not any(keyword in url.lower() for keyword in allowed_keywords):
         return
 
-    import asyncpg
-    conn = None
-    # Prepare data for CrawledData model fields
-    # Except for 'content', other fields are fetched from source, and content is filled with the result of crawling.
-    # 'type' and 'language' are fetched from source, so we need to modify the crawl function.
-    query = """
-    INSERT INTO crawled_data (url, title, snippet, image_url, date, language, type, pdf_url, content, created_at, updated_at)
-    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-    ON CONFLICT (url) DO UPDATE SET
-        title = EXCLUDED.title,
-        snippet = EXCLUDED.snippet,
-        image_url = EXCLUDED.image_url,
-        date = EXCLUDED.date,
-        language = EXCLUDED.language,
-        type = EXCLUDED.type,
-        pdf_url = EXCLUDED.pdf_url,
-        content = EXCLUDED.content,
-        updated_at = EXCLUDED.updated_at;
-    """
     now = datetime.utcnow()
     try:
-        conn = await asyncpg.connect(db_settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql"))
-        await conn.execute(query,
-                           data.get('url'), data.get('title'), data.get('snippet'),
-                           data.get('image_url'), data.get('date'), data.get('language'),
-                           data.get('type'), data.get('pdf_url'), data.get('content'),
-                           now, now)
+        async with acquire_pg_connection() as conn:
+            await conn.execute(UPSERT_DOCUMENT_QUERY,
+                data.get('url'), data.get('title'), data.get('snippet'),
+                data.get('image_url'), data.get('date'), data.get('language'),
+                data.get('type'), data.get('pdf_url'), data.get('content'),
+                now, now, data.get('etag'), data.get('last_modified'))
     except Exception as e:
         logger.error(f"Error saving document to PostgreSQL for url {data.get('url')}: {e}")
-    finally:
-        if conn:
-            await conn.close()
 
 async def save_documents_to_pg_bulk(data_list: List[Dict[str, Any]]):
-    # URL 필터링
-    filtered_data = []
+    """Upsert many documents with one COPY + one INSERT ... ON CONFLICT statement."""
+    # URL 필터링 (같은 URL이 여러 번 있으면 마지막 것만 저장)
+    filtered_data = {}
     allowed_keywords = ["news", "article", "youtube", "pdf", "arxiv"]
     
     for data in data_list:
@@ -137,43 +271,52 @@ async def save_documents_to_pg_bulk(data_list: List[Dict[str, Any]]):
             # logger.info(f"URL {url}이 허용된 키워드를 포함하지 않아 저장하지 않습니다.")
             continue
             
-        filtered_data.append(data)
+        filtered_data[url] = data
     
     if not filtered_data:
         return
         
-    import asyncpg
-    conn = None
-    query = """
-    INSERT INTO crawled_data (url, title, snippet, image_url, date, language, type, pdf_url, content, created_at, updated_at)
-    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-    ON CONFLICT (url) DO UPDATE SET
-        title = EXCLUDED.title,
-        snippet = EXCLUDED.snippet,
-        image_url = EXCLUDED.image_url,
-        date = EXCLUDED.date,
-        language = EXCLUDED.language,
-        type = EXCLUDED.type,
-        pdf_url = EXCLUDED.pdf_url,
-        content = EXCLUDED.content,
-        updated_at = EXCLUDED.updated_at;
-    """
     now = datetime.utcnow()
+    records = [
+        (data.get('url'), data.get('title'), data.get('snippet'),
+         data.get('image_url'), data.get('date'), data.get('language'),
+         data.get('type'), data.get('pdf_url'), data.get('content'),
+         now, now, data.get('etag'), data.get('last_modified'))
+        for data in filtered_data.values()
+    ]
     try:
-        conn = await asyncpg.connect(db_settings.DATABASE_URL.replace("postgresql+asyncpg", "postgresql"))
-        # 트랜잭션 시작
-        async with conn.transaction():
-            await asyncio.gather(*[
-                conn.execute(query,
-                    data.get('url'), data.get('title'), data.get('snippet'),
-                    data.get('image_url'), data.get('date'), data.get('language'),
-                    data.get('type'), data.get('pdf_url'), data.get('content'),
-                    now, now)
-                for data in filtered_data
-            ])
-        logger.info(f"{len(filtered_data)}개의 문서가 PostgreSQL에 저장되었습니다.")
+        async with acquire_pg_connection() as conn:
+            # 트랜잭션 시작 (staging 테이블은 commit 시 비워짐)
+            async with conn.transaction():
+                await conn.execute(CREATE_STAGING_TABLE_QUERY)
+                await conn.copy_records_to_table(STAGING_TABLE, records=records, columns=BULK_COLUMNS)
+                await conn.execute(BULK_UPSERT_QUERY)
+        logger.info(f"{len(records)}개의 문서가 PostgreSQL에 저장되었습니다.")
     except Exception as e:
         logger.error(f"Error saving documents to PostgreSQL in bulk: {e}")
-    finally:
-        if conn:
-            await conn.close()
\ No newline at end of file
+
+async def get_search_results_from_pg(key: str) -> Optional[List[Dict[str, Any]]]:
+    """Cached (unexpired) search results for *key*, or None."""
+    try:
+        async with acquire_pg_connection() as conn:
+            results = await conn.fetchval(SELECT_SEARCH_CACHE_QUERY, key, datetime.utcnow())
+        return json.loads(results) if results is not None else None
+    except Exception as e:
+        logger.error(f"Error fetching search cache from PostgreSQL: {e}")
+        return None
+
+async def save_search_results_to_pg(key: str, results: List[Dict[str, Any]], ttl: float):
+    now = datetime.utcnow()
+    try:
+        async with acquire_pg_connection() as conn:
+            await conn.execute(UPSERT_SEARCH_CACHE_QUERY, key, json.dumps(results, ensure_ascii=False),
+                               now, now + timedelta(seconds=ttl))
+    except Exception as e:
+        logger.error(f"Error saving search cache to PostgreSQL: {e}")
+
+async def purge_expired_search_results_in_pg():
+    try:
+        async with acquire_pg_connection() as conn:
+            await conn.execute(DELETE_EXPIRED_SEARCH_CACHE_QUERY, datetime.utcnow())
+    except Exception as e:
+        logger.error(f"Error purging search cache in PostgreSQL: {e}")
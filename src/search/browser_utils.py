@@ -1,7 +1,14 @@
+import random
+import asyncio
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
 from fake_useragent import UserAgent
 import httpx
 import ssl
 import certifi
+import structlog
+
+logger = structlog.get_logger(__name__)
 
 HEADTER_TEMPLATE = {
     "User-Agent": (
@@ -11,27 +18,200 @@ HEADTER_TEMPLATE = {
     ),
     "Referer": "",
 }
+ACCEPT_LANGUAGES = [
+    "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "en-US,en;q=0.9,ko;q=0.8",
+    "en-US,en;q=0.9",
+    "ko,en-US;q=0.9,en;q=0.8",
+]
 ctx = ssl.create_default_context(cafile=certifi.where())
 ua = UserAgent(platforms='desktop')
+# ua.random filters the whole UA database on every call, so sample a pool once per worker.
+USER_AGENTS = list({ua.random for _ in range(64)})
+
+
+@dataclass
+class BrowserPoolStats:
+    """Connection reuse counters of a pooled browser client (per worker)."""
+    requests: int = 0
+    new_connections: int = 0
+    tls_handshakes: int = 0
+    host_waits: int = 0
+    host_timeouts: int = 0
+
+    @property
+    def pool_hits(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    def as_dict(self) -> Dict[str, int]:
+        stats = asdict(self)
+        stats["pool_hits"] = self.pool_hits
+        return stats
+
+
+class _HostSlotStream(httpx.AsyncByteStream):
+    """Response stream that gives the per-host slot back once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """`AsyncHTTPTransport` with a per-host concurrency cap and connection reuse metrics.
+
+    httpx only limits connections globally, so a single slow news site could take
+    every slot of the pool. Each host gets its own semaphore that is held until the
+    response body is closed (streamed responses included). Waiting for a host slot
+    counts against the request's pool timeout, like waiting for a connection. A
+    host's semaphore lives only while requests hold or wait for it (the crawler
+    meets an unbounded number of hosts).
+    """
+
+    def __init__(self, max_connections_per_host: int = 10, stats: Optional[BrowserPoolStats] = None, **transport_kwargs):
+        self._transport = httpx.AsyncHTTPTransport(**transport_kwargs)
+        self.max_connections_per_host = max_connections_per_host
+        self.stats = stats if stats is not None else BrowserPoolStats()
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        # requests holding or waiting for each host's semaphore
+        self._host_users: Dict[str, int] = {}
+
+    async def _trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.new_connections += 1
+        elif event_name == "connection.start_tls.complete":
+            self.stats.tls_handshakes += 1
+
+    def _enter_host(self, host: str) -> asyncio.Semaphore:
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_connections_per_host)
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        return slot
+
+    def _leave_host(self, host: str) -> None:
+        self._host_users[host] -= 1
+        if self._host_users[host] == 0:
+            del self._host_users[host]
+            del self._host_slots[host]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        slot = self._enter_host(host)
+        if slot.locked():
+            self.stats.host_waits += 1
+        pool_timeout = request.extensions.get("timeout", {}).get("pool")
+        try:
+            await asyncio.wait_for(slot.acquire(), timeout=pool_timeout)
+        except asyncio.TimeoutError:
+            self._leave_host(host)
+            self.stats.host_timeouts += 1
+            raise httpx.PoolTimeout(f"No free connection slot for {host} within {pool_timeout} s", request=request)
+        except BaseException:
+            self._leave_host(host)
+            raise
 
-def load_browser_client():
-    HEADTER_TEMPLATE["User-Agent"] = ua.random
-    
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                slot.release()
+                self._leave_host(host)
+
+        self.stats.requests += 1
+        request.extensions.setdefault("trace", self._trace)
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            release()
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_HostSlotStream(response.stream, release),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+async def _rotate_headers(request: httpx.Request) -> None:
+    """Pick a fresh browser fingerprint for every request without rebuilding the client."""
+    request.headers["User-Agent"] = random.choice(USER_AGENTS)
+    request.headers["Accept-Language"] = random.choice(ACCEPT_LANGUAGES)
+
+
+def load_browser_client(max_connections: int = 200,
+                        max_keepalive_connections: int = 40,
+                        keepalive_expiry: float = 90,
+                        max_connections_per_host: int = 10,
+                        stats: Optional[BrowserPoolStats] = None) -> httpx.AsyncClient:
     browser_client = httpx.AsyncClient(
-        http2=True,
-        limits=httpx.Limits(
-            max_connections=200,
-            max_keepalive_connections=40,
-            keepalive_expiry=90,
-        ),
-        transport=httpx.AsyncHTTPTransport(
+        transport=PooledTransport(
+            max_connections_per_host=max_connections_per_host,
+            stats=stats,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
             retries=1,
             local_address=None,
             uds=None,
+            verify=ctx,
         ),
         headers=HEADTER_TEMPLATE,
-        follow_redirects=True,                    
+        event_hooks={"request": [_rotate_headers]},
+        follow_redirects=True,
         max_redirects=5,
-        verify=ctx,
     )
-    return browser_client
\ No newline at end of file
+    return browser_client
+
+
+class BrowserClientPool:
+    """Process-wide `httpx.AsyncClient` shared by every `/websearch` request.
+
+    Created once in the FastAPI lifespan so keep-alive connections (and HTTP/2
+    sessions) to serper.dev and the news sites survive across queries.
+    """
+
+    def __init__(self):
+        self.stats = BrowserPoolStats()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def start(self, **client_kwargs) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = load_browser_client(stats=self.stats, **client_kwargs)
+            logger.info("browser_pool_started", **client_kwargs)
+        return self._client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # lifespan not run (e.g. scripts / tests) - start with defaults
+            return self.start()
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("browser_pool_closed", **self.stats.as_dict())
+
+
+browser_pool = BrowserClientPool()
@@ -0,0 +1,161 @@
+import re
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+from src.models.model_list import get_llm_info
+from src.utils.tokenizer import get_tokenizer, tokenize
+from src.search.crawl import CRAWL_META_KEY
+from rich.console import Console
+
+console = Console()
+
+PARAGRAPH_SPLIT = re.compile(r"\n+")
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?。？！])\s+")
+
+# fields of a source that always go to the prompt (content is packed separately)
+SOURCE_FIELDS = ("title", "url", "snippet", "date")
+
+
+def chunk_text(text: str, chunk_chars: int = 800) -> List[str]:
+    """Split *text* into chunks of about `chunk_chars`, on paragraph then sentence boundaries."""
+    pieces = []
+    for paragraph in PARAGRAPH_SPLIT.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= chunk_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in SENTENCE_SPLIT.split(paragraph):
+            sentence = sentence.strip()
+            while len(sentence) > chunk_chars:
+                pieces.append(sentence[:chunk_chars])
+                sentence = sentence[chunk_chars:]
+            if sentence:
+                pieces.append(sentence)
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + len(piece) + 1 > chunk_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current}\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class BM25:
+    """Okapi BM25 over a small in-memory corpus (the chunks of one request)."""
+
+    def __init__(self, corpus: Sequence[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(doc) for doc in corpus]
+        self.doc_lens = [len(doc) for doc in corpus]
+        self.avg_len = (sum(self.doc_lens) / len(corpus)) if corpus else 0.0
+        doc_freq = Counter(term for doc in self.term_freqs for term in doc)
+        n = len(corpus)
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()}
+
+    def scores(self, query_terms: List[str]) -> List[float]:
+        query_terms = [term for term in set(query_terms) if term in self.idf]
+        results = []
+        for tf, doc_len in zip(self.term_freqs, self.doc_lens):
+            norm = self.k1 * (1 - self.b + self.b * doc_len / self.avg_len) if self.avg_len else self.k1
+            score = 0.0
+            for term in query_terms:
+                freq = tf.get(term)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            results.append(score)
+        return results
+
+
+class ContextPacker:
+    """Chunk crawled documents, rank chunks against the search queries with BM25 and
+    keep the best ones that fit the answer model's token budget.
+
+    Parameters
+    ----------
+    model : str
+        Answer model; its `context_window` / `max_tokens` in `LLM_TOKEN_INFO` bound the budget.
+    max_context_tokens : int
+        Hard cap on the packed web context (a 1M window does not mean we want 1M-token prompts).
+    reserve_tokens : int
+        Room kept for the prompt template, history and persona.
+    output_tokens : int, optional
+        Completion budget of the answer call (defaults to the model's `max_tokens`).
+    chunk_chars : int
+        Target chunk size in characters.
+    count_tokens : callable, optional
+        Token counter; defaults to the model's tokenizer (`get_tokenizer`).
+    """
+
+    def __init__(self, model: str, max_context_tokens: int = 24000, reserve_tokens: int = 4000,
+                 output_tokens: Optional[int] = None, chunk_chars: int = 800, count_tokens=None):
+        self.model = model
+        self.chunk_chars = chunk_chars
+        self.count_tokens = count_tokens or get_tokenizer(model).count
+        try:
+            token_info = get_llm_info(model)['token']
+            output_tokens = token_info['max_tokens'] if output_tokens is None else output_tokens
+            model_budget = token_info['context_window'] - output_tokens - reserve_tokens
+        except Exception:
+            model_budget = max_context_tokens
+        self.budget = max(min(max_context_tokens, model_budget), 0)
+
+    def pack(self, sources: List[Dict[str, Any]], queries: List[str], budget: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return copies of *sources* whose `content` holds only the selected chunks (in document order).
+
+        Uses the per-document `token_count` reported by the crawler (crawl meta) when present.
+        """
+        budget = self.budget if budget is None else budget
+        packed = [dict(source) for source in sources]
+
+        # metadata (title/url/snippet) of every source is always sent
+        used = sum(self.count_tokens(" ".join(str(source.get(field) or "") for field in SOURCE_FIELDS)) for source in packed)
+
+        content_tokens = 0
+        for source in packed:
+            token_count = (source.get(CRAWL_META_KEY) or {}).get('token_count')
+            content_tokens += token_count if token_count is not None else self.count_tokens(source.get('content') or "")
+        if used + content_tokens <= budget:
+            console.log(f"[pink bold]Context-Packing: everything fits, {used + content_tokens}/{budget} tokens")
+            return packed
+
+        chunk_refs, corpus = [], []
+        for doc_index, source in enumerate(packed):
+            for chunk_index, chunk in enumerate(chunk_text(source.get('content') or "", self.chunk_chars)):
+                chunk_refs.append((doc_index, chunk_index, chunk))
+                corpus.append(tokenize(chunk))
+        if not chunk_refs:
+            return packed
+
+        scores = BM25(corpus).scores(tokenize(" ".join(queries)))
+        ranked = sorted(range(len(chunk_refs)), key=lambda i: scores[i], reverse=True)
+
+        # first the best chunk of every document (coverage), then the rest by score
+        seen_docs, first_pass, second_pass = set(), [], []
+        for i in ranked:
+            doc_index = chunk_refs[i][0]
+            (second_pass if doc_index in seen_docs else first_pass).append(i)
+            seen_docs.add(doc_index)
+
+        selected = {}
+        for i in first_pass + second_pass:
+            doc_index, chunk_index, chunk = chunk_refs[i]
+            cost = self.count_tokens(chunk)
+            if used + cost > budget:
+                continue
+            used += cost
+            selected.setdefault(doc_index, []).append((chunk_index, chunk))
+
+        for doc_index, source in enumerate(packed):
+            chunks = sorted(selected.get(doc_index, []))
+            source['content'] = "\n...\n".join(chunk for _, chunk in chunks)
+
+        total_chunks = sum(len(chunks) for chunks in selected.values())
+        console.log(f"[pink bold]Context-Packing: {total_chunks}/{len(chunk_refs)} chunks, ~{used}/{budget} tokens")
+        return packed
@@ -1,16 +1,26 @@
+import sys
 import httpx
-import fitz
 import asyncio
 import uvloop
 import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Optional
 from urllib.parse import urlparse
-from src.converter import ExtractorRegistry
+from src.converter import ContentExtractor, ExtractorRegistry, FetchedPage, fetch_page
 from src.converter.news_extractors import NEWS_EXTRACTORS
 from src.converter.blog_extractors import BLOG_EXTRACTORS
 from src.converter.media_extractors import MEDIA_EXTRACTORS
-from src.converter.html_converter import HtmlConverter
-from src.db.pg_utils import get_document_from_pg
+from src.converter.rule_extractor import compile_extractor_rules
+from src.converter.html_engine import HtmlConversionEngine, convert_html
+from src.converter.pdf_engine import PdfExtractionEngine, extract_pdf_text, looks_like_pdf
+from src.converter.render_service import RENDER_DEADLINE, RenderService
+from src.db.pg_utils import get_document_from_pg, get_documents_from_pg, touch_documents_in_pg
 from src.search.browser_utils import load_browser_client
+from src.utils.cache import TTLByteLRUCache
+from src.utils.common import normalize_url
+from src.utils.tokenizer import get_tokenizer
+from src.utils.single_flight import SingleFlight, FileLockSingleFlight
 from structlog import get_logger
 from rich.console import Console
 
@@ -18,177 +28,462 @@ console = Console()
 logger = get_logger(__name__)
 asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
+# seconds a crawled_data row is served without revalidation, per content type
+DEFAULT_CACHE_TTL = {
+    "news": 30 * 60,
+    "wikipedia": 7 * 24 * 3600,
+    "arxiv": 30 * 24 * 3600,
+    "youtube": 7 * 24 * 3600,
+    "default": 24 * 3600,
+}
+
+# Internal crawl bookkeeping stored on each source; not sent to the LLM.
+CRAWL_META_KEY = "_crawl_meta"
+
+
+def strip_crawl_meta(source: dict) -> dict:
+    return {k: v for k, v in source.items() if k != CRAWL_META_KEY}
+
+
+class CrawlBudget:
+    """Per-request crawl budget: stop waiting once `quorum_sources` sources have at least
+    `quorum_min_chars` characters, or `deadline_ms` has passed since crawling started.
+
+    One budget may be shared by several `multiple_crawl` calls (streaming pipeline);
+    the clock starts with the first one.
+    """
+
+    def __init__(self, deadline_ms: Optional[float] = None, quorum_sources: Optional[int] = None, quorum_min_chars: int = 500):
+        self.deadline_ms = deadline_ms
+        self.quorum_sources = quorum_sources
+        self.quorum_min_chars = quorum_min_chars
+        self.started_at = None
+        self.good_sources = 0
+        self.satisfied = asyncio.Event()
+
+    def start(self) -> None:
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left until the deadline (None: no deadline)."""
+        if self.deadline_ms is None:
+            return None
+        self.start()
+        return max(self.deadline_ms / 1000 - (time.monotonic() - self.started_at), 0.0)
+
+    def record(self, source) -> None:
+        if len(source.get('content') or "") >= self.quorum_min_chars:
+            self.good_sources += 1
+            if self.quorum_sources and self.good_sources >= self.quorum_sources:
+                self.satisfied.set()
+
+    @property
+    def exhausted(self) -> bool:
+        return self.satisfied.is_set() or self.remaining() == 0.0
+
 class Crawler:
     '''
     return: title, url, snippet, image_url, date, content
     '''
-    def __init__(self, news_list, blog_list, media_list, use_db_content=False, max_content_length=20000):
+    def __init__(self, news_list, blog_list, media_list, use_db_content=False, max_content_length=20000, cache_ttl=None,
+                 memory_cache_bytes=64 * 1024 * 1024, memory_cache_ttl=600, single_flight=None,
+                 max_content_tokens=None, tokenizer_model="gpt-4o", html_conversion=None, extractor_rules=None,
+                 extractor_substring_fallback=False, pdf_extraction=None, media_options=None,
+                 render_service=None):
         self.news_list = news_list
         self.blog_list = blog_list
         self.media_list = media_list
+        # constructor options of media extractors, by domain (e.g. arxiv.org full_text / pdf_fallback)
+        self.media_options = media_options or {}
+        # declarative site rules (configs/extractors.yaml): {"news": {domain: rule}, "blog": {...}}
+        self.extractor_rules = extractor_rules or {}
+        self.extractor_substring_fallback = extractor_substring_fallback
         self.max_content_length = max_content_length
-        self.num_contents = 0
+        # token-based cut (language independent); max_content_length stays as a cheap pre-cut
+        self.max_content_tokens = max_content_tokens
+        self.tokenizer = get_tokenizer(tokenizer_model)
         self.use_db_content = use_db_content
-        self.html_converter = HtmlConverter()
+        self.cache_ttl = {**DEFAULT_CACHE_TTL, **(cache_ttl or {})}
+        # hot URLs: memory -> crawled_data -> network (per worker process)
+        self.memory_cache_ttl = memory_cache_ttl
+        self.memory_cache = TTLByteLRUCache(max_bytes=memory_cache_bytes) if memory_cache_bytes else None
+        # concurrent crawls of one URL (e.g. a breaking story) share a single fetch + extract
+        single_flight = {"enabled": True, **(single_flight or {})}
+        self.single_flight = SingleFlight() if single_flight["enabled"] else None
+        self.cross_worker_flight = None
+        if self.single_flight is not None and single_flight.get("cross_worker"):
+            self.cross_worker_flight = FileLockSingleFlight(
+                lock_dir=single_flight.get("lock_dir", "/tmp/tapestry-singleflight"),
+                wait_timeout=single_flight.get("wait_timeout", 3.0),
+                result_ttl=single_flight.get("result_ttl", 30.0),
+            )
+        # HTML -> text off the event loop (threads, or warm worker processes to avoid the GIL)
+        self.html_engine = HtmlConversionEngine(**(html_conversion or {}))
+        # PDF -> text within the content budget (worker processes; Range requests for .pdf URLs)
+        self.pdf_engine = PdfExtractionEngine(**(pdf_extraction or {}))
+        # pooled headless browser for extractors whose pages need JavaScript (off: plain fetch)
+        render_service = dict(render_service or {})
+        self.render_service = RenderService(**render_service) if render_service.pop("enabled", False) else None
 
         self._setup_extractors()
 
+    def single_flight_stats(self) -> dict:
+        stats = self.single_flight.stats() if self.single_flight is not None else {}
+        if self.cross_worker_flight is not None:
+            stats["cross_worker"] = self.cross_worker_flight.stats()
+        return stats
+
     def _setup_extractors(self):
-        self.extractor_registry = ExtractorRegistry()
+        # host-suffix index; the substring scan over can_handle is an opt-in fallback
+        self.extractor_registry = ExtractorRegistry(substring_fallback=self.extractor_substring_fallback)
+        # selector rules are compiled once here; a domain with a rule needs no extractor class
+        news_rules = compile_extractor_rules(self.extractor_rules.get("news"))
+        blog_rules = compile_extractor_rules(self.extractor_rules.get("blog"))
         
         # news extractors
         for news_domain in self.news_list:
             console.log(f"[green]Crawler-Extract: {news_domain} registered")
-            self.extractor_registry.register(NEWS_EXTRACTORS[news_domain]())
+            self.extractor_registry.register(news_rules.get(news_domain) or NEWS_EXTRACTORS[news_domain]())
 
         # blog extractors
         for blog_domain in self.blog_list:
             console.log(f"[green]Crawler-Extract: {blog_domain} registered")
-            self.extractor_registry.register(BLOG_EXTRACTORS[blog_domain]())
+            self.extractor_registry.register(blog_rules.get(blog_domain) or BLOG_EXTRACTORS[blog_domain]())
 
         # media extractors
         for media_domain in self.media_list:
             console.log(f"[green]Crawler-Extract: {media_domain} registered")
-            self.extractor_registry.register(MEDIA_EXTRACTORS[media_domain]())
+            self.extractor_registry.register(MEDIA_EXTRACTORS[media_domain](**self.media_options.get(media_domain, {})))
+
+        for extractor in self.extractor_registry.extractors():
+            extractor.html_parser = self.html_engine.parser
+            if extractor.rendered:
+                extractor.render_service = self.render_service
+            if hasattr(extractor, "pdf_engine"):
+                extractor.pdf_engine = self.pdf_engine
+
+    def media_stats(self) -> dict:
+        """Counters of the media extractors that run an engine (transcripts, Wikipedia)."""
+        return {type(extractor).__name__: extractor.engine.stats()
+                for extractor in self.extractor_registry.extractors() if hasattr(extractor, "engine")}
+
+    def focus_contents(self, sources, queries):
+        """Copies of *sources* with content narrowed to *queries* where the site's
+        extractor supports it (e.g. the relevant segments of a YouTube transcript).
+
+        Applied on the prompt path only: the crawl caches and DB keep the full content.
+        """
+        focused = []
+        for source in sources:
+            extractor = self.extractor_registry.get_extractor(source.get('url') or "")
+            focus = getattr(extractor, "focus", None)
+            if focus is not None and source.get('content'):
+                source = {**source, 'content': focus(source['content'], queries)}
+            focused.append(source)
+        return focused
 
     def extract_pdf_text(self, pdf_bytes: bytes) -> str:
-        text = ""
-        try:
-            with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
-                # maximum 10 pages
-                max_pages = min(10, len(doc))
-                text = "".join(doc[i].get_text() for i in range(max_pages))
-            return text
-        except Exception as e:
-            return ""
+        return extract_pdf_text(pdf_bytes, self.max_content_length, self.pdf_engine.max_pages)
 
     def extract_html_text(self, html_str: str, url: str) -> str:
-        try:
-            result = self.html_converter.convert_string(html_str, url=url)
-            return result.markdown.strip()
-        except Exception as e:
-            return ""
+        return convert_html(html_str, url, self.html_engine.parser)
+
+    async def _fetch_text(self, url: str, browser_client, validators: dict = None,
+                          page: Optional[FetchedPage] = None) -> str:
+        """Download *url* (unless *page* already holds it) and return decoded body text.
 
-    async def _fetch_text(self, url: str, browser_client) -> str:
-        """Download *url* and return decoded body text."""
+        If *validators* is given it is filled with the response ETag / Last-Modified.
+        """
         
         try:
-            # 1. set timeout
-            timeout = httpx.Timeout(connect=0.5, read=0.8, write=0.3, pool=0.2)
-            
-            # 2. stream data
-            async with browser_client.stream('GET', url, timeout=timeout) as response:
-                if response.status_code != 200:
+            # 1. stream data within the central size/time limits (src.converter.fetch_page);
+            #    for PDF URLs ask for the leading bytes only
+            byte_range = None
+            if page is None:
+                byte_range = self.pdf_engine.range_bytes if looks_like_pdf(url) else None
+                page = await fetch_page(url, browser_client, byte_range=byte_range)
+            if page is None:
+                return ""
+            if page.partial and byte_range and "application/pdf" not in page.content_type:
+                page = await fetch_page(url, browser_client)
+                if page is None:
                     return ""
-                
-                content_type = response.headers.get('content-type', '').lower()
-                content_length = response.headers.get('content-length')
-                
-                # 3. check content size
-                if content_length and int(content_length) > 25 * 1024 * 1024:  # 25MB 제한
-                    return ""
-                
-                # 4. read chunk by chunk
-                chunks = []
-                total_size = 0
-                max_size = 10 * 1024 * 1024  # 10MB 제한
-                
-                async for chunk in response.aiter_bytes(chunk_size=8192):  # 8KB 청크
-                    total_size += len(chunk)
-                    if total_size > max_size:
-                        break
-                    chunks.append(chunk)
-                
-                content_bytes = b''.join(chunks)
-                
-                # 5. process by content type
-                if "application/pdf" in content_type:
-                    return await asyncio.wait_for(
-                        asyncio.to_thread(self.extract_pdf_text, content_bytes), 
-                        timeout=1.5
-                    )
-                elif "text/html" in content_type or "text/" in content_type:
-                    # HTML/text processing
+
+            if validators is not None:
+                validators.update(page.validators)
+
+            content_type = page.content_type
+            content_bytes = page.content
+
+            # 2. process by content type
+            if "application/pdf" in content_type:
+                text = await self.pdf_engine.extract(content_bytes, self.max_content_length)
+                if page.partial and byte_range:
+                    if text.strip():
+                        self.pdf_engine.range_hits += 1
+                        return text
+                    # the leading slice was not readable (e.g. page tree at the end of the file)
+                    self.pdf_engine.range_misses += 1
+                    page = await fetch_page(url, browser_client)
+                    if page is None:
+                        return ""
+                    text = await self.pdf_engine.extract(page.content, self.max_content_length)
+                return text
+            elif "text/html" in content_type or "text/" in content_type:
+                # HTML/text processing
+                try:
+                    # 3. auto detect encoding and process
+                    text_content = content_bytes.decode('utf-8')
+                except UnicodeDecodeError:
+                    # try other encoding if UTF-8 fails
+                    import chardet
+                    detected = chardet.detect(content_bytes[:10000])  # check first 10KB
+                    encoding = detected.get('encoding', 'utf-8')
                     try:
-                        # 6. auto detect encoding and process
-                        text_content = content_bytes.decode('utf-8')
-                    except UnicodeDecodeError:
-                        # try other encoding if UTF-8 fails
-                        import chardet
-                        detected = chardet.detect(content_bytes[:10000])  # check first 10KB
-                        encoding = detected.get('encoding', 'utf-8')
-                        try:
-                            text_content = content_bytes.decode(encoding, errors='ignore')
-                        except:
-                            text_content = content_bytes.decode('utf-8', errors='ignore')
-                    
-                    if "text/html" in content_type:
-                        return await asyncio.wait_for(
-                            asyncio.to_thread(self.extract_html_text, text_content, url), 
-                            timeout=0.5
-                        )
-                    else:
-                        # return text directly (apply size limit)
-                        return text_content[:self.max_content_length]
+                        text_content = content_bytes.decode(encoding, errors='ignore')
+                    except:
+                        text_content = content_bytes.decode('utf-8', errors='ignore')
+                
+                if "text/html" in content_type:
+                    return await self.html_engine.convert(text_content, url)
                 else:
-                    return ""
-                    
+                    # return text directly (apply size limit)
+                    return text_content[:self.max_content_length]
+            else:
+                return ""
+                
         except Exception as e:
             console.log(f"[red]{url}: {e}")
             console.log("[red]****************")
             return ""
 
-    async def crawl(self, browser_client, source):
+    async def _truncate(self, content: str):
+        """Cut *content* to `max_content_tokens` model tokens; returns (content, token_count)."""
+        if self.max_content_tokens:
+            truncate = lambda: self.tokenizer.truncate(content, self.max_content_tokens)
+        else:
+            truncate = lambda: (content, self.tokenizer.count(content))
+        if len(content) < 2000:
+            return truncate()
+        # BPE over a long page takes a few ms; keep it off the event loop
+        return await asyncio.to_thread(truncate)
+
+    def _content_kind(self, url: str, source) -> str:
+        lowered = url.lower()
+        if "arxiv.org" in lowered:
+            return "arxiv"
+        if "wikipedia.org" in lowered:
+            return "wikipedia"
+        if "youtube.com" in lowered or "youtu.be" in lowered:
+            return "youtube"
+        if str(source.get('type', '')).lower() == "news" or any(domain in lowered for domain in self.news_list):
+            return "news"
+        return "default"
+
+    def _ttl(self, url: str, source) -> float:
+        return self.cache_ttl.get(self._content_kind(url, source), self.cache_ttl["default"])
 
+    def _is_fresh(self, pg_doc, url: str, source) -> bool:
+        updated_at = pg_doc.get('updated_at')
+        if updated_at is None:
+            return False
+        return datetime.utcnow() - updated_at <= timedelta(seconds=self._ttl(url, source))
+
+    def _remember(self, url: str, source, content: str, crawl_meta, age: float = 0.0) -> None:
+        """Put a crawled (or DB-served) document into the in-memory tier."""
+        if self.memory_cache is None or not content:
+            return
+        ttl = min(self.memory_cache_ttl, self._ttl(url, source) - age)
+        if ttl <= 0:
+            return
+        entry = {"content": content, "etag": crawl_meta.get("etag"), "last_modified": crawl_meta.get("last_modified")}
+        self.memory_cache.set(url, entry, ttl=ttl, size=sys.getsizeof(content) + 256)
+
+    async def _revalidate(self, url: str, pg_doc, browser_client) -> Optional[FetchedPage]:
+        """Conditional GET for a stale row: a page with status_code 304 if it did not
+        change, the new page (200) to extract from instead of fetching again, or None
+        (request failed, or the site's extractor does not read the page itself).
+        """
+        extractor = self.extractor_registry.get_extractor(url)
+        if extractor is not None and type(extractor).extract is not ContentExtractor.extract:
+            # API / transcript extractors: a conditional GET of the page URL says nothing
+            return None
+        headers = {}
+        if pg_doc.get('etag'):
+            headers['If-None-Match'] = pg_doc['etag']
+        if pg_doc.get('last_modified'):
+            headers['If-Modified-Since'] = pg_doc['last_modified']
+        elif pg_doc.get('updated_at'):
+            # no stored validator: ask whether it changed since we crawled it
+            headers['If-Modified-Since'] = format_datetime(pg_doc['updated_at'].replace(tzinfo=timezone.utc), usegmt=True)
+        request_url = extractor.resolve_url(url) if extractor is not None else url
+        try:
+            return await fetch_page(request_url, browser_client, encoding=extractor.encoding if extractor else None,
+                                    headers=headers, conditional=True)
+        except Exception as e:
+            console.log(f"[red]Revalidation failed for {url}: {e}")
+            return None
+
+    async def _fetch_content(self, url: str, browser_client, title: str = "", page: Optional[FetchedPage] = None):
+        """Fetch + extract *url* (from *page* when it was already downloaded). Returns
+        [content, fetched, validators] (JSON friendly so the result can be handed to other workers)."""
+        validators = {"etag": None, "last_modified": None}
+        fetched = False
+        try:
+            extractor = self.extractor_registry.get_extractor(url)
+            if extractor:
+                content = await extractor.extract(url, browser_client, validators=validators, page=page)
+            else:
+                content = await self._fetch_text(url, browser_client, validators=validators, page=page)
+            fetched = True
+        except httpx.HTTPStatusError as e:
+            console.log(f"[red]HTTP error {e.response.status_code} for {url}: {e}")
+            content = f"Failed to fetch with status {e.response.status_code}"
+        except httpx.RequestError as e:
+            console.log(f"[red]Request error for {url}: {e}")
+            content = f"Request failed: {type(e).__name__}"
+        except asyncio.TimeoutError:
+            console.log(f"[red]Timeout while processing {url}")
+            content = "Processing timed out"
+        except Exception as e:
+            console.log(f"[red]An unexpected error occurred while crawling {url} ({title}): {e}")
+            console.log("[red]****************")
+            content = f"Error: {type(e).__name__}" # 예외 유형도 포함
+        return [content or "", fetched, validators]
+
+    async def _fetch_shared(self, url: str, browser_client, title: str = "", page: Optional[FetchedPage] = None):
+        """`_fetch_content` behind the single-flight layers: concurrent crawls of the
+        same normalized URL share one fetch (per worker, and optionally per host)."""
+        if self.single_flight is None:
+            return await self._fetch_content(url, browser_client, title, page)
+        key = normalize_url(url)
+        if self.cross_worker_flight is not None:
+            fetch = lambda: self.cross_worker_flight.do(key, lambda: self._fetch_content(url, browser_client, title, page),
+                                                        share=lambda result: result[1])
+        else:
+            fetch = lambda: self._fetch_content(url, browser_client, title, page)
+        content, fetched, validators = await self.single_flight.do(key, fetch)
+        return content, fetched, dict(validators)
+
+    async def crawl(self, browser_client, source, prefetched_docs=None, revalidated_urls=None):
+        """Crawl a single source.
+
+        prefetched_docs: {url: row} from a batched crawled_data lookup. When given,
+        a URL missing from it is a known cache miss and no per-URL query is made.
+        revalidated_urls: collects URLs confirmed by a 304 so the caller can refresh
+        them in one UPDATE; when None the row is refreshed immediately.
+        """
         url = source['url']
-        if "arxiv.org/abs" in url:
-            url = url.replace("/abs/", "/pdf/")
-        
+        crawl_meta = {"from_cache": False, "etag": None, "last_modified": None}
+
         content = ""
-        if self.use_db_content:
-            pg_doc = await get_document_from_pg(url)
+        # body of a conditional GET that answered 200: extracted instead of fetched again
+        revalidated_page = None
+        memory_entry = self.memory_cache.get(url) if self.memory_cache is not None else None
+        if memory_entry is not None:
+            content = memory_entry["content"]
+            crawl_meta.update(from_cache=True, etag=memory_entry["etag"], last_modified=memory_entry["last_modified"])
+
+        if not content and self.use_db_content:
+            if prefetched_docs is not None:
+                pg_doc = prefetched_docs.get(url)
+            else:
+                pg_doc = await get_document_from_pg(url)
             if pg_doc and pg_doc.get('content'):
-                content = pg_doc.get('content')
+                age = None
+                if self._is_fresh(pg_doc, url, source):
+                    age = (datetime.utcnow() - pg_doc['updated_at']).total_seconds()
+                else:
+                    revalidated_page = await self._revalidate(url, pg_doc, browser_client)
+                    if revalidated_page is not None and revalidated_page.status_code == 304:
+                        revalidated_page = None
+                        age = 0.0
+                        if revalidated_urls is not None:
+                            revalidated_urls.append(url)
+                        else:
+                            await touch_documents_in_pg([url])
+                if age is not None:
+                    content = pg_doc.get('content')
+                    crawl_meta.update(from_cache=True, etag=pg_doc.get('etag'), last_modified=pg_doc.get('last_modified'))
+                    self._remember(url, source, content, crawl_meta, age=age)
         
+        fetched = False
         if not content:
-            try:
-                extractor = self.extractor_registry.get_extractor(url)
-                if extractor:
-                    content = await extractor.extract(url, browser_client)
-                else:
-                    content = await self._fetch_text(url, browser_client)
-            except httpx.HTTPStatusError as e:
-                console.log(f"[red]HTTP error {e.response.status_code} for {url}: {e}")
-                content = f"Failed to fetch with status {e.response.status_code}"
-            except httpx.RequestError as e:
-                console.log(f"[red]Request error for {url}: {e}")
-                content = f"Request failed: {type(e).__name__}"
-            except asyncio.TimeoutError:
-                console.log(f"[red]Timeout while processing {url}")
-                content = "Processing timed out"
-            except Exception as e:
-                console.log(f"[red]An unexpected error occurred while crawling {url} ({source['title']}): {e}")
-                console.log("[red]****************")
-                content = f"Error: {type(e).__name__}" # 예외 유형도 포함
-
-        source['content'] = content[:self.max_content_length]
+            content, fetched, validators = await self._fetch_shared(url, browser_client, source['title'],
+                                                                    revalidated_page)
+            crawl_meta.update(validators)
+
+        content, crawl_meta['token_count'] = await self._truncate(content[:self.max_content_length])
+        source['content'] = content
+        if fetched:
+            self._remember(url, source, source['content'], crawl_meta)
         console.log(f"[green]Crawler-Extract (title): {source['title']}")
         console.log(f"[green]Crawler-Extract (content): {source['content'][:100]}")
         console.log(f"[green]Crawler-Extract (url): {source['url']}")
         console.log(f"[green]--------------------------------")
-        if len(source['content']) > 0:
-            self.num_contents += 1
         del source['type']
         del source['language']
+        source[CRAWL_META_KEY] = crawl_meta
         return source
 
-    async def multiple_crawl(self, browser_client, sources):
+    async def multiple_crawl(self, browser_client, sources, budget: Optional[CrawlBudget] = None):
+        """Crawl *sources* concurrently.
+
+        With a `budget`, returns once its quorum or deadline is reached: unfinished
+        crawls are cancelled and only the finished sources are returned (in input order).
+        """
         start_time = time.time()
-        # browser_client = load_browser_client()
-        scraped_results = await asyncio.gather(*[self.crawl(browser_client, source) for source in sources])
+        if budget is not None:
+            budget.start()
+        prefetched_docs = None
+        revalidated_urls = []
+        if self.use_db_content:
+            # one round-trip for every cached URL of this request; only misses hit the network
+            urls = [source['url'] for source in sources]
+            if self.memory_cache is not None:
+                urls = [url for url in urls if url not in self.memory_cache]
+            prefetched_docs = await get_documents_from_pg(urls) if urls else {}
+            console.log(f"[pink bold]Crawler-Cache: memory {len(sources) - len(urls)}, db {len(prefetched_docs)}/{len(sources)} hits ({time.time() - start_time:.2f} seconds)")
+        # inherited by the crawl tasks (renders stop at the deadline too); reset on return
+        remaining = budget.remaining() if budget is not None else None
+        deadline_token = RENDER_DEADLINE.set(time.monotonic() + remaining if remaining is not None else None)
+        tasks = [asyncio.ensure_future(self.crawl(browser_client, source, prefetched_docs, revalidated_urls)) for source in sources]
+        try:
+            if budget is None:
+                await asyncio.gather(*tasks)
+            else:
+                await self._wait_for_budget(tasks, budget)
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            RENDER_DEADLINE.reset(deadline_token)
+        scraped_results = [task.result() for task in tasks if not task.cancelled() and task.exception() is None]
+        if revalidated_urls:
+            await touch_documents_in_pg(revalidated_urls)
         console.log(f"[pink bold]Crawler-Extract: {time.time() - start_time:.2f} seconds")
         console.print("[green]****************")
-        console.print(f"[green]Extracted contents: {self.num_contents}/{len(sources)}")
+        # counted per call: several multiple_crawl calls may run concurrently (streaming pipeline)
+        num_contents = sum(1 for result in scraped_results if result['content'])
+        console.print(f"[green]Extracted contents: {num_contents}/{len(sources)}"
+                      + (f" (cancelled {len(sources) - len(scraped_results)} by crawl budget)" if len(scraped_results) < len(sources) else ""))
         console.print("[green]****************")
-        self.num_contents = 0
-        return scraped_results
\ No newline at end of file
+        return scraped_results
+
+    @staticmethod
+    async def _wait_for_budget(tasks, budget: CrawlBudget) -> None:
+        pending = set(tasks)
+        quorum_waiter = asyncio.ensure_future(budget.satisfied.wait())
+        try:
+            while pending and not budget.exhausted:
+                done, pending = await asyncio.wait(pending | {quorum_waiter}, timeout=budget.remaining(),
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                pending.discard(quorum_waiter)
+                for task in done:
+                    if task is not quorum_waiter and not task.cancelled() and task.exception() is None:
+                        budget.record(task.result())
+        finally:
+            quorum_waiter.cancel()
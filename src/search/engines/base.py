@@ -0,0 +1,88 @@
+import time
+import asyncio
+from typing import Any, AsyncIterator, Dict, List
+from rich.console import Console
+from .cache import SearchCache, search_cache_key
+from .dedup import ResultDeduplicator
+
+console = Console()
+
+
+class BaseSearchClientAsync:
+    """Shared plumbing of the search engine clients.
+
+    Subclasses implement `_search(payload)`; `single_search` puts the optional
+    `SearchCache` in front of it so a recurring rewritten query does not hit the
+    paid API again, and `multiple_search` merges + deduplicates several payloads.
+    """
+
+    engine_name: str = ""
+    search_cache: SearchCache = None
+
+    def _cache_key(self, payload: Dict[str, Any]) -> str:
+        # youtube.com is appended to exclude_domain at runtime when transcripts are off
+        exclude_domain = sorted({domain for domain in self.exclude_domain if domain != "youtube.com"})
+        return search_cache_key(self.engine_name, payload,
+                                num=self.num_output_per_query,
+                                youtube=self.use_youtube_transcript,
+                                exclude_domain=exclude_domain)
+
+    async def _search(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def single_search(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if self.search_cache is None:
+            return await self._search(payload)
+        key = self._cache_key(payload)
+        results = await self.search_cache.get(key)
+        if results is not None:
+            return results
+        results = await self._search(payload)
+        await self.search_cache.set(key, payload, results)
+        return results
+
+    async def multiple_search(self, payloads: List[Dict[str, Any]], simhash_threshold: int = 20) -> List[Dict[str, Any]]:
+        """
+        Perform multiple search requests, merge, and deduplicate results.
+        Deduplication is done first by URL, then by SimHash of the snippet.
+        """
+        start_time = time.time()
+        results_from_searches = await asyncio.gather(
+            *[self.single_search(payload) for payload in payloads]
+        )
+
+        raw_merged_results = []
+        split_val = self.top_k // len(results_from_searches) if self.top_k is not None and results_from_searches else None
+        for result_list in results_from_searches:
+            raw_merged_results.extend(result_list[:split_val] if split_val is not None else result_list)
+
+        console.log(f"[pink bold]WebSearch-Search: {time.time() - start_time:.2f} seconds")
+
+        start_time = time.time()
+        final_results = ResultDeduplicator(simhash_threshold).filter(raw_merged_results)
+        console.log(f"[pink bold]WebSearch-Deduplication: {time.time() - start_time:.2f} seconds")
+        return final_results
+
+    async def multiple_search_stream(self, payloads: List[Dict[str, Any]],
+                                     simhash_threshold: int = 20) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Streaming variant of `multiple_search`: yields the new (deduplicated) results of
+        each payload as soon as its search returns, so crawling can start before the
+        slowest search call is done. Earlier-finishing payloads win ties in dedup.
+        """
+        start_time = time.time()
+        deduplicator = ResultDeduplicator(simhash_threshold)
+        split_val = self.top_k // len(payloads) if self.top_k is not None and payloads else None
+        tasks = [asyncio.ensure_future(self.single_search(payload)) for payload in payloads]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result_list = await next_done
+                if split_val is not None:
+                    result_list = result_list[:split_val]
+                new_results = deduplicator.filter(result_list)
+                console.log(f"[pink bold]WebSearch-Search (stream): +{len(new_results)} results at {time.time() - start_time:.2f} seconds")
+                if new_results:
+                    yield new_results
+        finally:
+            for task in tasks:
+                task.cancel()
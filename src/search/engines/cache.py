@@ -0,0 +1,142 @@
+import json
+import hashlib
+import unicodedata
+from typing import Any, Dict, List, Optional
+from src.utils.cache import TTLByteLRUCache
+from src.db.pg_utils import get_search_results_from_pg, save_search_results_to_pg
+from rich.console import Console
+
+console = Console()
+
+# seconds a search response is reused, per requested period
+DEFAULT_PERIOD_TTL = {
+    "Past hour": 5 * 60,
+    "Past 24 hours": 30 * 60,
+    "Past week": 3 * 3600,
+    "Past month": 12 * 3600,
+    "Past year": 24 * 3600,
+    "Any time": 24 * 3600,
+}
+# upper bound per search type (news rankings move faster than the period suggests)
+DEFAULT_TYPE_MAX_TTL = {
+    "News": 30 * 60,
+}
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+
+def search_cache_key(engine_name: str, payload: Dict[str, Any], **engine_options) -> str:
+    """Stable key of a search request: engine + normalized payload + result-shaping options."""
+    normalized = {
+        "engine": engine_name,
+        "query": normalize_query(payload.get("query", "")),
+        "type": payload.get("type"),
+        "language": payload.get("language"),
+        "period": payload.get("period") or "Any time",
+        **engine_options,
+    }
+    raw = json.dumps(normalized, sort_keys=True, ensure_ascii=False)
+    return f"{engine_name}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+
+class MemorySearchCacheBackend:
+    """Per-worker backend on top of `TTLByteLRUCache`."""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.cache = TTLByteLRUCache(max_bytes=max_bytes)
+
+    async def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, results: List[Dict[str, Any]], ttl: float) -> None:
+        size = sum(len(str(result)) for result in results) + 256
+        self.cache.set(key, results, ttl=ttl, size=size)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+class PostgresSearchCacheBackend:
+    """Backend on the `search_cache` table, shared by every worker and replica."""
+
+    async def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        return await get_search_results_from_pg(key)
+
+    async def set(self, key: str, results: List[Dict[str, Any]], ttl: float) -> None:
+        await save_search_results_to_pg(key, results, ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+SEARCH_CACHE_BACKENDS = {
+    "memory": MemorySearchCacheBackend,
+    "postgres": PostgresSearchCacheBackend,
+}
+
+
+class SearchCache:
+    """Search-response cache shared by all engines, with period-aware TTLs.
+
+    Parameters
+    ----------
+    backend : MemorySearchCacheBackend | PostgresSearchCacheBackend
+        Storage; anything with async `get(key)` / `set(key, results, ttl)`.
+    period_ttl : dict, optional
+        Seconds per payload period ("Past hour", ..., "Any time").
+    type_max_ttl : dict, optional
+        Cap per payload type (e.g. News).
+    """
+
+    def __init__(self, backend, period_ttl: Optional[Dict[str, float]] = None,
+                 type_max_ttl: Optional[Dict[str, float]] = None):
+        self.backend = backend
+        self.period_ttl = {**DEFAULT_PERIOD_TTL, **(period_ttl or {})}
+        self.type_max_ttl = {**DEFAULT_TYPE_MAX_TTL, **(type_max_ttl or {})}
+        self.hits = 0
+        self.misses = 0
+
+    def ttl(self, payload: Dict[str, Any]) -> float:
+        ttl = self.period_ttl.get(payload.get("period") or "Any time", self.period_ttl["Any time"])
+        return min(ttl, self.type_max_ttl.get(payload.get("type"), ttl))
+
+    async def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        results = await self.backend.get(key)
+        if results is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # callers (crawler) mutate the result dicts in place
+        return [dict(result) for result in results]
+
+    async def set(self, key: str, payload: Dict[str, Any], results: List[Dict[str, Any]]) -> None:
+        ttl = self.ttl(payload)
+        if not results or ttl <= 0:
+            # an empty list is usually a failed API call; never pin it
+            return
+        await self.backend.set(key, [dict(result) for result in results], ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "backend": self.backend.stats(),
+        }
+
+
+def load_search_cache(cache_config: Optional[Dict[str, Any]]) -> Optional[SearchCache]:
+    """Build the cache from the `web_search.cache` config section (None when disabled)."""
+    if not cache_config or not cache_config.get("enabled", False):
+        return None
+    backend_name = cache_config.get("backend", "memory")
+    if backend_name not in SEARCH_CACHE_BACKENDS:
+        raise ValueError(f"Invalid search cache backend: {backend_name}")
+    backend_kwargs = {"max_bytes": cache_config["max_bytes"]} if backend_name == "memory" and "max_bytes" in cache_config else {}
+    console.log(f"[green]WebSearch-Cache: {backend_name} backend")
+    return SearchCache(SEARCH_CACHE_BACKENDS[backend_name](**backend_kwargs),
+                       period_ttl=cache_config.get("period_ttl"),
+                       type_max_ttl=cache_config.get("type_max_ttl"))
@@ -0,0 +1,156 @@
+import numpy as np
+from typing import Any, Dict, Iterable, List
+from simhash import Simhash
+
+# SWAR popcount constants (numpy < 2.0 has no bitwise_count)
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+
+def popcount64(values: np.ndarray) -> np.ndarray:
+    """Number of set bits of every uint64 in *values*."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    x = values - ((values >> np.uint64(1)) & _M1)
+    x = (x & _M2) + ((x >> np.uint64(2)) & _M2)
+    x = (x + (x >> np.uint64(4))) & _M4
+    return (x * _H01) >> np.uint64(56)
+
+
+def result_fingerprint_text(item: Dict[str, Any]) -> str:
+    return (item.get("title", "") + " " + item.get("snippet", "")).strip()
+
+
+class SimhashIndex:
+    """Packed uint64 SimHash fingerprints with a vectorized "any within distance" check.
+
+    Each lookup is one XOR + popcount over the kept fingerprints in NumPy instead of
+    a Python loop of `Simhash.distance` calls.
+    """
+
+    def __init__(self, threshold: int = 20, capacity: int = 64):
+        self.threshold = threshold
+        self._hashes = np.empty(capacity, dtype=np.uint64)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def has_near_duplicate(self, fingerprint: int) -> bool:
+        if self._size == 0:
+            return False
+        distances = popcount64(self._hashes[:self._size] ^ np.uint64(fingerprint))
+        return bool((distances <= self.threshold).any())
+
+    def add(self, fingerprint: int) -> None:
+        if self._size == len(self._hashes):
+            self._hashes = np.resize(self._hashes, 2 * len(self._hashes))
+        self._hashes[self._size] = fingerprint
+        self._size += 1
+
+
+class ResultDeduplicator:
+    """Incremental dedup of search results: first by URL, then by SimHash of title + snippet.
+
+    Same decisions as the former per-engine loop: the first occurrence wins, and
+    items without title/snippet are always kept. Results can be fed one batch at a
+    time (e.g. as each search payload completes).
+    """
+
+    def __init__(self, simhash_threshold: int = 20):
+        self.index = SimhashIndex(threshold=simhash_threshold)
+        self.seen_urls = set()
+        self.num_duplicate = 0
+
+    def accept(self, item: Dict[str, Any]) -> bool:
+        """True if *item* is new (and remember it), False if it duplicates an accepted one."""
+        url = item.get("url")
+        if url:
+            if url in self.seen_urls:
+                return False
+            self.seen_urls.add(url)
+
+        content = result_fingerprint_text(item)
+        if not content:
+            return True
+        fingerprint = Simhash(content.split()).value
+        if self.index.has_near_duplicate(fingerprint):
+            self.num_duplicate += 1
+            return False
+        self.index.add(fingerprint)
+        return True
+
+    def filter(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [item for item in items if self.accept(item)]
+
+
+def deduplicate_results(items: Iterable[Dict[str, Any]], simhash_threshold: int = 20) -> List[Dict[str, Any]]:
+    return ResultDeduplicator(simhash_threshold).filter(items)
+
+
+def _legacy_deduplicate(items: List[Dict[str, Any]], simhash_threshold: int = 20) -> List[Dict[str, Any]]:
+    """The O(n^2) loop previously copied into every engine (kept for the benchmark below)."""
+    url_deduplicated_results_dict = {}
+    for result in items:
+        url = result.get('url')
+        if url:
+            if url not in url_deduplicated_results_dict:
+                url_deduplicated_results_dict[url] = result
+        else:
+            url_deduplicated_results_dict[f"no_url_{len(url_deduplicated_results_dict)}_{id(result)}"] = result
+
+    final_results = []
+    hashes = []
+    for item in url_deduplicated_results_dict.values():
+        content = result_fingerprint_text(item)
+        if not content:
+            final_results.append(item)
+            continue
+        current_hash = Simhash(content.split())
+        if not any(current_hash.distance(existing_hash) <= simhash_threshold for existing_hash in hashes):
+            final_results.append(item)
+            hashes.append(current_hash)
+    return final_results
+
+
+if __name__ == "__main__":
+    # microbenchmark: python -m src.search.engines.dedup
+    import random
+    import time
+
+    random.seed(0)
+    vocabulary = [f"w{i}" for i in range(5000)]
+
+    def make_results(n: int) -> List[Dict[str, Any]]:
+        results = []
+        for i in range(n):
+            if results and random.random() < 0.2:
+                # near duplicate (syndicated article) or repeated URL
+                base = dict(random.choice(results))
+                if random.random() < 0.5:
+                    base["url"] = f"https://mirror.example.com/{i}"
+                    words = base["snippet"].split()
+                    words[random.randrange(len(words))] = random.choice(vocabulary)
+                    base["snippet"] = " ".join(words)
+                results.append(base)
+                continue
+            results.append({
+                "title": " ".join(random.choices(vocabulary, k=8)),
+                "snippet": " ".join(random.choices(vocabulary, k=30)),
+                "url": f"https://news.example.com/{i}",
+            })
+        return results
+
+    for n in (30, 300, 3000):
+        results = make_results(n)
+        start = time.perf_counter()
+        legacy = _legacy_deduplicate(results)
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        current = deduplicate_results(results)
+        current_time = time.perf_counter() - start
+        assert [id(item) for item in legacy] == [id(item) for item in current]
+        print(f"n={n:5d} kept={len(current):5d} legacy={legacy_time * 1000:9.2f} ms "
+              f"numpy={current_time * 1000:8.2f} ms speedup={legacy_time / current_time:6.1f}x")
@@ -1,15 +1,35 @@
 import asyncio
 import time
 from src.types.language import Language
-from typing import Any, Dict, List, Callable
+from typing import Any, Dict, List, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
 from duckduckgo_search import DDGS
-from simhash import Simhash
 from rich.console import Console
+from .base import BaseSearchClientAsync
+from .cache import SearchCache
 
 console = Console()
 
+# payload type -> DDGS method (Scholar / Shopping / Places fall back to text search)
+DDGS_METHODS = {
+    "Search": "text",
+    "Images": "images",
+    "Videos": "videos",
+    "News": "news",
+}
 
-class DuckDuckGoClientAsync:
+# One bounded pool per worker process, shared by every request (the client itself is per request).
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ddgs")
+    return _executor
+
+
+class DuckDuckGoClientAsync(BaseSearchClientAsync):
     """Async wrapper around DuckDuckGo search & scrape endpoints.
 
     Parameters
@@ -18,21 +38,29 @@ class DuckDuckGoClientAsync:
         Your DuckDuckGo API key.
     """
 
+    engine_name = "duckduckgo"
+
     def __init__(self,
                  num_output_per_query: int = 20, 
                  content_type_timeout: float = 0.25,
                  use_youtube_transcript: bool = True,
                  top_k = None,
-                 exclude_domain: List[str] = []):
+                 exclude_domain: List[str] = [],
+                 search_cache: SearchCache = None,
+                 timeout: float = 5,
+                 max_workers: int = 8):
         self.num_output_per_query = num_output_per_query
         self.content_type_timeout = content_type_timeout
         self.use_youtube_transcript = use_youtube_transcript
         self.top_k = top_k
         self.exclude_domain = exclude_domain
+        self.search_cache = search_cache
+        self.timeout = timeout
+        self.max_workers = max_workers
     # ---------------------------------------------------------------------
     # Public API
     # ---------------------------------------------------------------------
-    async def single_search(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _search(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Perform a Serper "search" request and return the raw JSON."""
         lang = Language.from_code(payload['language'])
 
@@ -49,92 +77,28 @@ class DuckDuckGoClientAsync:
 
         # gl-hl
         region = f"{lang.query_params['gl']}-{lang.query_params['hl']}"
-        ddgs = DDGS()
-        if payload['type'] == 'Search':
-            results = ddgs.text(payload['query'], max_results=self.num_output_per_query, region=region, timelimit=period)
-        elif payload['type'] == 'Images':
-            results = ddgs.images(payload['query'], max_results=self.num_output_per_query, region=region, timelimit=period)
-        elif payload['type'] == 'Videos':
-            results = ddgs.videos(payload['query'], max_results=self.num_output_per_query, region=region, timelimit=period)
-        elif payload['type'] == 'News':
-            results = ddgs.news(payload['query'], max_results=self.num_output_per_query, region=region, timelimit=period)
-        elif payload['type'] == 'Scholar':
-            results = ddgs.text(payload['query'], max_results=self.num_output_per_query, region=region, timelimit=period)
-        elif payload['type'] == 'Shopping':
-            results = ddgs.text(payload['query'], max_results=self.num_output_per_query, region=region, timelimit=period)
-        elif payload['type'] == 'Places':
-            results = ddgs.text(payload['query'], max_results=self.num_output_per_query, region=region, timelimit=period)
-        else:
-            results = ddgs.text(payload['query'], max_results=self.num_output_per_query, region=region, timelimit=period)     
-        return self.extract_components(payload['language'], payload['type'], results)
-
-    async def multiple_search(self, payloads: List[Dict[str, Any]], simhash_threshold: int = 20) -> List[Dict[str, Any]]:
-        """
-        Perform multiple Serper "search" requests, merge, and deduplicate results.
-        Deduplication is done first by URL, then by SimHash of the snippet.
-        """
-        start_time = time.time()
-        results_from_searches = await asyncio.gather(
-            *[self.single_search(payload) for payload in payloads]
-        )
-
-        if self.top_k is not None:
-            num_iters = len(results_from_searches)
-            split_val = self.top_k // num_iters
-        
-        raw_merged_results = []
-        for i, result_list in enumerate(results_from_searches):
-            if self.top_k is not None:
-                raw_merged_results.extend(result_list[:split_val])
-            else:
-                raw_merged_results.extend(result_list)
-
-        console.log(f"[pink bold]WebSearch-Search: {time.time() - start_time:.2f} seconds")
-
-        start_time = time.time()
-        url_deduplicated_results_dict = {}
-        for result in raw_merged_results:
-            url = result.get('url')
-            if url: 
-                 if url not in url_deduplicated_results_dict:
-                    url_deduplicated_results_dict[url] = result
-            else:
-                unique_key_for_no_url_item = f"no_url_{len(url_deduplicated_results_dict)}_{id(result)}" # Add id for more uniqueness
-                url_deduplicated_results_dict[unique_key_for_no_url_item] = result
-
-        url_deduplicated_results = list(url_deduplicated_results_dict.values())
-
-        if not url_deduplicated_results:
+        # DDGS is blocking: run it on the bounded pool so the event loop (and the
+        # other payloads of multiple_search) keep going
+        loop = asyncio.get_running_loop()
+        try:
+            results = await asyncio.wait_for(
+                loop.run_in_executor(_get_executor(self.max_workers), self._ddgs_search,
+                                     payload['query'], payload['type'], region, period),
+                timeout=self.timeout,
+            )
+        except asyncio.TimeoutError:
+            console.log(f"[red]DuckDuckGo search timed out ({self.timeout}s): {payload['query']}")
             return []
+        except Exception as e:
+            console.log(f"[red]DuckDuckGo search failed for {payload['query']}: {e}")
+            return []
+        return self.extract_components(payload['language'], payload['type'], results)
 
-        final_results = []
-        hashes = []
-        num_duplicate = 0
-
-        for item in url_deduplicated_results:
-            snippet = item.get("snippet", "")
-            title = item.get("title", "")
-            content = (title + " " + snippet).strip()
-            if not content: 
-                final_results.append(item)
-                continue
-
-            current_hash = Simhash(content.split()) 
-
-            is_duplicate = False
-            for existing_hash in hashes:
-                dist = current_hash.distance(existing_hash)
-                if dist <= simhash_threshold:
-                    is_duplicate = True
-                    num_duplicate += 1
-                    break
-            
-            if not is_duplicate:
-                final_results.append(item)
-                hashes.append(current_hash)
-        
-        console.log(f"[pink bold]WebSearch-Deduplication: {time.time() - start_time:.2f} seconds")
-        return final_results
+    def _ddgs_search(self, query: str, search_type: str, region: str, period: str) -> List[Dict[str, Any]]:
+        # runs in a worker thread; DDGS' own timeout bounds the thread even after wait_for gave up
+        ddgs = DDGS(timeout=self.timeout)
+        search = getattr(ddgs, DDGS_METHODS.get(search_type, "text"))
+        return search(query, max_results=self.num_output_per_query, region=region, timelimit=period) or []
 
     # ------------------------------------------------------------------
     # Helpers
@@ -2,8 +2,9 @@ import time
 import asyncio
 from typing import Any, Dict, List, Callable
 from src.types.language import Language
-from simhash import Simhash
 from rich.console import Console
+from .base import BaseSearchClientAsync
+from .cache import SearchCache
 
 console = Console()
 
@@ -16,7 +17,7 @@ SERP_URL = "https://serpapi.com/search"
 # =============================
 # SerpClient (Async)
 # =============================
-class SerpClientAsync:
+class SerpClientAsync(BaseSearchClientAsync):
     """Async wrapper around Serp search & scrape endpoints.
 
     Parameters
@@ -24,6 +25,8 @@ class SerpClientAsync:
     api_key : str
         Your Serp API key.
     """
+
+    engine_name = "serp"
     def __init__(self, 
                  browser_client, 
                  api_key: str, 
@@ -31,7 +34,8 @@ class SerpClientAsync:
                  content_type_timeout: float = 0.25,
                  use_youtube_transcript: bool = True,
                  top_k = None,
-                 exclude_domain: List[str] = []):
+                 exclude_domain: List[str] = [],
+                 search_cache: SearchCache = None):
         self.client = browser_client
         self.api_key = api_key
         self.num_output_per_query = num_output_per_query
@@ -39,10 +43,11 @@ class SerpClientAsync:
         self.use_youtube_transcript = use_youtube_transcript
         self.top_k = top_k
         self.exclude_domain = exclude_domain
+        self.search_cache = search_cache
     # ---------------------------------------------------------------------
     # Public API
     # ---------------------------------------------------------------------
-    async def single_search(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    async def _search(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Perform a Serper "search" request and return the raw JSON."""
         lang = Language.from_code(payload['language'])
         period = payload['period']
@@ -80,74 +85,6 @@ class SerpClientAsync:
         else:
             return self.extract_components(payload['language'], resp.json())
 
-    async def multiple_search(self, payloads: List[Dict[str, Any]], simhash_threshold: int = 20) -> List[Dict[str, Any]]:
-        """
-        Perform multiple Serper "search" requests, merge, and deduplicate results.
-        Deduplication is done first by URL, then by SimHash of the snippet.
-        """
-        start_time = time.time()
-        results_from_searches = await asyncio.gather(
-            *[self.single_search(payload) for payload in payloads]
-        )
-
-        if self.top_k is not None:
-            num_iters = len(results_from_searches)
-            split_val = self.top_k // num_iters
-        
-        raw_merged_results = []
-        for i, result_list in enumerate(results_from_searches):
-            if self.top_k is not None:
-                raw_merged_results.extend(result_list[:split_val])
-            else:
-                raw_merged_results.extend(result_list)
-
-        console.log(f"[pink bold]WebSearch-Search: {time.time() - start_time:.2f} seconds")
-
-        start_time = time.time()
-        url_deduplicated_results_dict = {}
-        for result in raw_merged_results:
-            url = result.get('url')
-            if url: 
-                 if url not in url_deduplicated_results_dict:
-                    url_deduplicated_results_dict[url] = result
-            else:
-                unique_key_for_no_url_item = f"no_url_{len(url_deduplicated_results_dict)}_{id(result)}" # Add id for more uniqueness
-                url_deduplicated_results_dict[unique_key_for_no_url_item] = result
-
-        url_deduplicated_results = list(url_deduplicated_results_dict.values())
-
-        if not url_deduplicated_results:
-            return []
-
-        final_results = []
-        hashes = []
-        num_duplicate = 0
-
-        for item in url_deduplicated_results:
-            snippet = item.get("snippet", "")
-            title = item.get("title", "")
-            content = (title + " " + snippet).strip()
-            if not content: 
-                final_results.append(item)
-                continue
-
-            current_hash = Simhash(content.split()) 
-
-            is_duplicate = False
-            for existing_hash in hashes:
-                dist = current_hash.distance(existing_hash)
-                if dist <= simhash_threshold:
-                    is_duplicate = True
-                    num_duplicate += 1
-                    break
-            
-            if not is_duplicate:
-                final_results.append(item)
-                hashes.append(current_hash)
-        
-        console.log(f"[pink bold]WebSearch-Deduplication: {time.time() - start_time:.2f} seconds")
-        return final_results
-
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
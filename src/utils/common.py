@@ -2,6 +2,7 @@ import re
 import yaml
 import uuid
 from typing import Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import json
 
 
@@ -90,6 +91,29 @@ def extract_urls(text: str, max_num_urls: int = 3) -> list[str]:
     return unique_result[:max_num_urls]
 
 
+TRACKING_QUERY_PREFIXES = ("utm_", "fbclid", "gclid")
+
+
+def normalize_url(url: str) -> str:
+    """
+    같은 문서를 가리키는 URL을 하나의 키로 정규화합니다.
+    (scheme/host 소문자, 기본 포트·fragment·트래킹 파라미터 제거, 쿼리 정렬)
+    :param url: 원본 URL
+    :return: 정규화된 URL
+    """
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)) else None
+    netloc = f"{host}:{port}" if port else host
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.lower().startswith(TRACKING_QUERY_PREFIXES))
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+
 if __name__ == "__main__":
     test = "http://192.168.0.10:8000/portal/"
     test = "https://arxiv.org/pdf/2409.01140  https://docs.llamaindex.ai/en/stable/examples/vector_stores/qdrant_hybrid/"
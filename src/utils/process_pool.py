@@ -0,0 +1,118 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Tuple
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+
+def _worker_processes(executor: ProcessPoolExecutor) -> List[Any]:
+    """The worker `Process` objects of *executor*.
+
+    `ProcessPoolExecutor` has no public API for its workers; this reads its private
+    `_processes` dict (CPython 3.8+), and returns [] if a later version drops it, in
+    which case a rebuild only shuts the old pool down without killing a stuck worker.
+    """
+    return list((getattr(executor, "_processes", None) or {}).values())
+
+
+class WarmProcessPool:
+    """A spawn-context `ProcessPoolExecutor` whose workers are warmed when it is built,
+    rebuilt once when it breaks.
+
+    `start` blocks (it spawns and warms every worker); from the event loop the pool is
+    built and rebuilt through `asyncio.to_thread`, behind a lock. A generation counter
+    makes the callers that saw the same broken pool trigger a single rebuild, and the
+    broken executor is shut down before it is replaced.
+
+    Parameters
+    ----------
+    name : str
+        Log name of the pool.
+    max_workers : int
+        Worker processes.
+    warm_up : callable
+        Run once in every worker at start (module level, picklable); returns the pid.
+    warm_up_args : tuple
+        Arguments of `warm_up`.
+    """
+
+    def __init__(self, name: str, max_workers: int, warm_up: Callable[..., int], warm_up_args: Tuple = ()):
+        self.name = name
+        self.max_workers = max_workers
+        self.warm_up = warm_up
+        self.warm_up_args = warm_up_args
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.generation = 0
+        self.rebuilds = 0
+
+    def _create(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that already runs an event loop and threads is unsafe
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=self.warm_up, initargs=self.warm_up_args)
+        # submitting max_workers tasks makes the pool start every worker now
+        warm_ups = [executor.submit(self.warm_up, *self.warm_up_args) for _ in range(self.max_workers)]
+        pids = {warm_up.result() for warm_up in warm_ups}
+        logger.info(f"{self.name}_pool_started", workers=len(pids), generation=self.generation)
+        return executor
+
+    def start(self) -> None:
+        """Spawn and warm the workers (blocking; called at startup, outside the loop's hot path)."""
+        if self._executor is None:
+            self._executor = self._create()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _ensure(self) -> ProcessPoolExecutor:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        if self._executor is None:
+            async with self._lock:
+                if self._executor is None:
+                    self._executor = await asyncio.to_thread(self._create)
+        return self._executor
+
+    async def rebuild(self, generation: int, terminate: bool = False) -> None:
+        """Replace the pool of *generation* (no-op if another caller already did).
+
+        With *terminate*, its workers are killed first (e.g. one stuck past its timeout);
+        the executor does not say which worker runs a task, and with few workers
+        replacing all of them is the simple, bounded option.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if generation != self.generation or self._executor is None:
+                return
+            broken, self._executor = self._executor, None
+            self.generation += 1
+            self.rebuilds += 1
+            if terminate:
+                for process in _worker_processes(broken):
+                    process.terminate()
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = await asyncio.to_thread(self._create)
+
+    async def run(self, fn: Callable[..., Any], *args, default: Any = None, on_submit=None) -> Any:
+        """`fn(*args)` in a worker; *default* if the pool broke (it is rebuilt for later calls).
+
+        *on_submit* receives the pool generation the task runs in (for `rebuild`).
+        """
+        executor = await self._ensure()
+        generation = self.generation
+        if on_submit is not None:
+            on_submit(generation)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # a worker died (crash, OOM, recycle)
+            logger.error(f"{self.name}_pool_broken", generation=generation)
+            await self.rebuild(generation)
+            return default
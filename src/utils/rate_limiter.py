@@ -0,0 +1,95 @@
+import os
+import time
+import fcntl
+import asyncio
+from typing import Optional
+
+
+class IntervalRateLimiter:
+    """At most one call per `interval` seconds (e.g. an API's published request rate).
+
+    Callers reserve consecutive slots; a caller whose slot is more than *max_wait*
+    seconds away gets False at once instead of queueing behind the others, so a
+    burst cannot push requests past a crawl deadline. With `state_path`, the next
+    free slot is kept in that file under `flock`, so every uvicorn worker of the
+    host shares one limit; without it the limit is per process.
+
+    Parameters
+    ----------
+    interval : float
+        Minimum seconds between two calls.
+    state_path : str, optional
+        File shared by the workers (its directory is created).
+    """
+
+    POLL_INTERVAL = 0.01
+    LOCK_TIMEOUT = 0.5
+
+    def __init__(self, interval: float, state_path: Optional[str] = None):
+        self.interval = interval
+        self.state_path = state_path
+        if state_path:
+            os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+        self._next_slot = 0.0
+        self.waited = 0
+        self.rejected = 0
+
+    def _reserve_local(self, now: float, max_wait: float) -> Optional[float]:
+        wait = self._next_slot - now
+        if wait > max_wait:
+            return None
+        self._next_slot = max(now, self._next_slot) + self.interval
+        return wait
+
+    async def _reserve_shared(self, max_wait: float) -> Optional[float]:
+        fd = os.open(self.state_path, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            deadline = time.monotonic() + self.LOCK_TIMEOUT
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        return None
+                    await asyncio.sleep(self.POLL_INTERVAL)
+            try:
+                # wall clock: the slot is compared across processes
+                now = time.time()
+                try:
+                    next_slot = float(os.pread(fd, 64, 0) or 0)
+                except ValueError:
+                    next_slot = 0.0
+                wait = next_slot - now
+                if wait > max_wait:
+                    return None
+                os.ftruncate(fd, 0)
+                os.pwrite(fd, repr(max(now, next_slot) + self.interval).encode(), 0)
+                return wait
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    async def acquire(self, max_wait: float = float("inf")) -> bool:
+        """Wait for the next free slot; False (no slot taken) if it is beyond *max_wait*."""
+        if self.state_path:
+            try:
+                wait = await self._reserve_shared(max_wait)
+            except OSError:
+                # shared state unusable (e.g. read-only /tmp): keep the per-process limit
+                wait = self._reserve_local(time.monotonic(), max_wait)
+        else:
+            # no await between the check and the reservation
+            wait = self._reserve_local(time.monotonic(), max_wait)
+        if wait is None:
+            self.rejected += 1
+            return False
+        if wait > 0:
+            self.waited += 1
+            await asyncio.sleep(wait)
+        return True
+
+    def stats(self) -> dict:
+        return {"interval": self.interval, "shared": bool(self.state_path), "waited": self.waited,
+                "rejected": self.rejected}
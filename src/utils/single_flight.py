@@ -0,0 +1,208 @@
+import os
+import json
+import time
+import fcntl
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+
+class SingleFlight:
+    """Collapse concurrent calls for the same key into one in-flight task.
+
+    The first caller (leader) starts the task; callers arriving while it runs
+    (followers) await the same task. The task is shielded while other callers still
+    wait for it, so one cancelled caller (client disconnect, crawl deadline) does not
+    abort the fetch for the others; when the last waiter is cancelled the task is
+    cancelled too, so abandoned work frees its connections and workers.
+    State is process-local: one instance per uvicorn worker.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self.leaders = 0
+        self.followers = 0
+        self.abandoned = 0
+
+    def _done(self, key: Hashable, task: asyncio.Future) -> None:
+        # a cancelled task may already have been replaced by a new leader's
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            self._waiters.pop(key, None)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done: self._done(key, done))
+            self.leaders += 1
+        else:
+            self.followers += 1
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._inflight.get(key) is task and self._waiters[key] == 1 and not task.done():
+                # nobody else waits for the result
+                self.abandoned += 1
+                task.cancel()
+                self._done(key, task)
+            raise
+        finally:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"leaders": self.leaders, "followers": self.followers, "abandoned": self.abandoned,
+                "inflight": len(self._inflight)}
+
+
+class FileLockSingleFlight:
+    """Single flight across the workers of one host using `flock` on a per-key lock file.
+
+    The worker holding the lock runs `fn` and writes its (JSON serialisable) result
+    to a sidecar file; workers that were waiting on the lock read that result
+    instead of repeating the work. A waiter gives up after `wait_timeout` seconds
+    and runs `fn` itself, so a stuck leader never blocks a request for long.
+
+    Parameters
+    ----------
+    lock_dir : str
+        Directory for lock and result files (must be shared by the workers).
+    wait_timeout : float
+        Seconds to wait for another worker's fetch before doing it ourselves.
+    result_ttl : float
+        Seconds a result file is handed to later callers.
+    """
+
+    POLL_INTERVAL = 0.05
+    SWEEP_EVERY = 200
+
+    def __init__(self, lock_dir: str, wait_timeout: float = 3.0, result_ttl: float = 30.0):
+        self.lock_dir = lock_dir
+        self.wait_timeout = wait_timeout
+        self.result_ttl = result_ttl
+        os.makedirs(lock_dir, exist_ok=True)
+        self.leaders = 0
+        self.shared_hits = 0
+        self.wait_timeouts = 0
+        self._writes = 0
+
+    def _paths(self, key: str):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        base = os.path.join(self.lock_dir, digest)
+        return base + ".lock", base + ".json"
+
+    async def _acquire(self, fd: int) -> bool:
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    return False
+                await asyncio.sleep(self.POLL_INTERVAL)
+
+    def _read_result(self, result_path: str) -> Optional[Any]:
+        try:
+            if time.time() - os.path.getmtime(result_path) > self.result_ttl:
+                return None
+            with open(result_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_result(self, result_path: str, result: Any) -> None:
+        tmp_path = f"{result_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, result_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("single_flight_write_failed", path=result_path, error=str(e))
+            return
+        self._writes += 1
+        if self._writes % self.SWEEP_EVERY == 0:
+            self._sweep()
+
+    def _sweep(self) -> None:
+        # result files are only useful for `result_ttl`; a lock file is per URL and rarely
+        # reused, so one nobody holds is removed too (`_lock` notices a removed file)
+        now = time.time()
+        try:
+            with os.scandir(self.lock_dir) as entries:
+                for entry in entries:
+                    if now - entry.stat().st_mtime <= self.result_ttl:
+                        continue
+                    if entry.name.endswith(".json"):
+                        os.unlink(entry.path)
+                    elif entry.name.endswith(".lock"):
+                        self._unlink_unused_lock(entry.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _unlink_unused_lock(lock_path: str) -> None:
+        fd = os.open(lock_path, os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return
+        try:
+            os.unlink(lock_path)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    async def _lock(self, lock_path: str):
+        """(fd, acquired) of the key's lock file; retried when a sweep removed the file
+        between our open and flock (a lock on the unlinked file would exclude nobody)."""
+        while True:
+            fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o644)
+            try:
+                acquired = await self._acquire(fd)
+            except BaseException:
+                os.close(fd)
+                raise
+            try:
+                if not acquired or os.fstat(fd).st_ino == os.stat(lock_path).st_ino:
+                    return fd, acquired
+            except FileNotFoundError:
+                pass
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]],
+                 share: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Run `fn` once per key across workers; `share(result)` False keeps a result
+        (e.g. a failed fetch) from being handed to other callers."""
+        lock_path, result_path = self._paths(key)
+        fd, acquired = await self._lock(lock_path)
+        try:
+            if acquired:
+                result = self._read_result(result_path)
+                if result is not None:
+                    self.shared_hits += 1
+                    return result
+                self.leaders += 1
+            else:
+                self.wait_timeouts += 1
+            result = await fn()
+            if acquired and (share is None or share(result)):
+                self._write_result(result_path, result)
+            return result
+        finally:
+            if acquired:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def stats(self) -> Dict[str, int]:
+        return {"leaders": self.leaders, "shared_hits": self.shared_hits, "wait_timeouts": self.wait_timeouts}
@@ -0,0 +1,151 @@
+import os
+import re
+import importlib.util
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import List, Tuple
+from structlog import get_logger
+
+logger = get_logger(__name__)
+
+CJK = re.compile(r"[ᄀ-ᇿ぀-ヿ㄰-㆏㐀-鿿가-힯]")
+PARAGRAPH_BOUNDARY = re.compile(r"\n\s*\n|\n")
+SENTENCE_BOUNDARY = re.compile(r"[.!?。？！](?=\s)")
+WORD = re.compile(r"\w+", re.UNICODE)
+
+# tiktoken encoding per model family (LLM_TOKEN_INFO model_type prefixes). Anthropic and
+# Google do not publish a local tokenizer; cl100k_base is the closest cheap stand-in.
+ENCODING_BY_MODEL = [
+    ("gpt-4o", "o200k_base"),
+    ("gpt-4.1", "o200k_base"),
+    ("o1", "o200k_base"),
+    ("o3", "o200k_base"),
+    ("o4", "o200k_base"),
+]
+DEFAULT_ENCODING = "cl100k_base"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate: ~1 token per CJK/Hangul character, ~4 chars per token otherwise."""
+    if not text:
+        return 0
+    cjk = len(CJK.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words, plus character bigrams of CJK/Hangul words (particles/suffixes
+    make whole Korean words a poor match on their own). Terms for lexical matching."""
+    terms = []
+    for word in WORD.findall(text.lower()):
+        terms.append(word)
+        if CJK.search(word) and len(word) > 2:
+            terms.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return terms
+
+
+@contextmanager
+def _bundled_tiktoken_files():
+    """Point tiktoken at the BPE files litellm ships while an encoding is loaded, so
+    workers never download them at runtime.
+
+    tiktoken only takes its cache dir from `TIKTOKEN_CACHE_DIR`; the variable is set
+    for the duration of the load, only when the user has not set it, and removed
+    afterwards, so other tiktoken users in the process see the environment unchanged.
+    """
+    spec = importlib.util.find_spec("litellm")
+    bundled = None
+    if not os.getenv("TIKTOKEN_CACHE_DIR") and spec and spec.origin:
+        bundled = os.path.join(os.path.dirname(spec.origin), "litellm_core_utils", "tokenizers")
+        if not os.path.isdir(bundled):
+            bundled = None
+    if bundled is None:
+        yield
+        return
+    os.environ["TIKTOKEN_CACHE_DIR"] = bundled
+    try:
+        yield
+    finally:
+        os.environ.pop("TIKTOKEN_CACHE_DIR", None)
+
+
+class Tokenizer:
+    """Token counting / truncation for one model (tiktoken, or a heuristic when unavailable)."""
+
+    def __init__(self, encoding_name: str):
+        self.encoding_name = encoding_name
+        self._encoding = None
+        try:
+            import tiktoken
+            with _bundled_tiktoken_files():
+                self._encoding = tiktoken.get_encoding(encoding_name)
+        except Exception as e:
+            logger.warning("tokenizer_fallback", encoding=encoding_name, error=str(e))
+            self.encoding_name = "heuristic"
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def encode(self, text: str) -> List[int]:
+        return self._encoding.encode(text, disallowed_special=())
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is None:
+            return estimate_tokens(text)
+        return len(self.encode(text))
+
+    def truncate(self, text: str, max_tokens: int) -> Tuple[str, int]:
+        """Cut *text* to at most *max_tokens*, preferably at a paragraph or sentence boundary.
+
+        Returns the truncated text and its token count.
+        """
+        if not text:
+            return "", 0
+        if self._encoding is None:
+            count = estimate_tokens(text)
+            if count <= max_tokens:
+                return text, count
+            prefix = text[:int(len(text) * max_tokens / count)]
+        else:
+            tokens = self.encode(text)
+            if len(tokens) <= max_tokens:
+                return text, len(tokens)
+            # a multi-byte character split by the cut decodes to U+FFFD; drop it
+            prefix = self._encoding.decode(tokens[:max_tokens]).rstrip("�")
+
+        cut = _boundary(prefix)
+        truncated = prefix[:cut].rstrip()
+        return truncated, self.count(truncated)
+
+
+def _boundary(prefix: str, min_ratio: float = 0.5) -> int:
+    """Position of the last paragraph (else sentence) break in the back half of *prefix*."""
+    floor = int(len(prefix) * min_ratio)
+    for pattern in (PARAGRAPH_BOUNDARY, SENTENCE_BOUNDARY):
+        last = None
+        for match in pattern.finditer(prefix, floor):
+            last = match
+        if last is not None:
+            return last.end()
+    return len(prefix)
+
+
+def encoding_for_model(model_name: str) -> str:
+    name = model_name.split("/")[-1]
+    for prefix, encoding_name in ENCODING_BY_MODEL:
+        if name.startswith(prefix):
+            return encoding_name
+    return DEFAULT_ENCODING
+
+
+@lru_cache(maxsize=None)
+def _tokenizer_for_encoding(encoding_name: str) -> Tokenizer:
+    return Tokenizer(encoding_name)
+
+
+def get_tokenizer(model_name: str) -> Tokenizer:
+    """Cached tokenizer for *model_name* (one instance per encoding and process)."""
+    return _tokenizer_for_encoding(encoding_for_model(model_name))
@@ -39,6 +39,7 @@ def parse_args():
     parser.set_defaults(use_youtube_transcript=False)
     parser.add_argument('--top_k', type=int, default=None, help='top_k 값')
     parser.add_argument('--num_requests', type=int, default=1, help='동시 요청 개수')
+    parser.add_argument('--fast_first_token', action='store_true', help='스니펫 기반 답변을 먼저 스트리밍')
     return parser.parse_args()
 
 async def request_web_search(
@@ -52,7 +53,8 @@ async def request_web_search(
         target_nuance: str = 'Natural', 
         stream: bool = True, 
         use_youtube_transcript: bool = False, 
-        top_k: int = None):
+        top_k: int = None,
+        fast_first_token: bool = False):
     
     # previous_messages = [{"role": "user", "content": "what is an ai search engine?"}, {"role": "assistant", "content": "An AI search engine is a search engine that uses artificial intelligence to improve its search results. It can understand the user's query and provide relevant results."}]
     payload = {
@@ -65,7 +67,8 @@ async def request_web_search(
         "messages": previous_messages,
         "stream": stream,
         "use_youtube_transcript": use_youtube_transcript,
-        "top_k": top_k
+        "top_k": top_k,
+        "fast_first_token": fast_first_token
     }
     url = SERVER_URL
     async with aiohttp.ClientSession() as session:
@@ -80,6 +83,8 @@ async def request_web_search(
                     elif data_json["status"] == "failure":
                         console.print(f"[red]Session {session_id}: {data_json}")
                         break
+                    elif data_json["status"] == "refine":
+                        console.print(f"[magenta]Session {session_id}: {data_json}")
                     elif data_json["status"] == "streaming":
                         delta = data_json['delta']['content']
                         console.print(f"[green]{delta}")
@@ -87,11 +92,11 @@ async def request_web_search(
                         console.print(f"[yellow bold]Session {session_id}: {data_json}")
                         break
 
-async def run_concurrent_requests(query: str, num_requests: int = 10, language: str = 'en', search_type: str = 'auto', persona_prompt: str = 'N/A', custom_prompt: str = 'N/A', target_nuance: str = 'Natural', stream: bool = True, use_youtube_transcript: bool = False, top_k: int = None):
+async def run_concurrent_requests(query: str, num_requests: int = 10, language: str = 'en', search_type: str = 'auto', persona_prompt: str = 'N/A', custom_prompt: str = 'N/A', target_nuance: str = 'Natural', stream: bool = True, use_youtube_transcript: bool = False, top_k: int = None, fast_first_token: bool = False):
     tasks = []
     for i in range(num_requests):
         session_id = f"session_{i:03d}"
-        task = request_web_search(query, session_id, search_type, [], language, persona_prompt, custom_prompt, target_nuance, stream, use_youtube_transcript, top_k)
+        task = request_web_search(query, session_id, search_type, [], language, persona_prompt, custom_prompt, target_nuance, stream, use_youtube_transcript, top_k, fast_first_token)
         tasks.append(task)
     await asyncio.gather(*tasks)
 
@@ -106,7 +111,8 @@ def main(args):
         args.target_nuance,
         args.stream,
         args.use_youtube_transcript,
-        args.top_k
+        args.top_k,
+        args.fast_first_token
     ))
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+import pytest
+from src.converter.html_converter import HtmlConverter, available_parsers
+
+# edge cases the backends must agree on (bs4 output is the golden reference)
+GOLDEN_CORPUS = {
+    "plain": "<html><head><title>제목</title></head><body><p>첫 문단</p><p>second  paragraph</p></body></html>",
+    "removed_tags": ("<html><body><header>h</header><nav>menu<a>x</a></nav><p>keep</p><script>var a=1;</script>"
+                     "<style>p{}</style><aside>side</aside><footer>f</footer>tail</body></html>"),
+    "custom_tags": "<html><body><navbar>n</navbar><sidebar>s</sidebar><side-bar>sb</side-bar><p>body</p></body></html>",
+    "hidden": ("<html><body><div style='display:none'>x<span style='DISPLAY: none'>y</span></div>"
+               "<p style='color:red'>shown</p><p style='display:block'>also</p></body></html>"),
+    "tail_text": "<html><body><p>a<script>b</script>c<style>d</style>e</p></body></html>",
+    "comments": "<html><body><!-- comment --><p>text<!-- inner --> more</p></body></html>",
+    "entities": "<html><body><p>AT&amp;T &lt;tag&gt; &nbsp;space &copy; 2025</p></body></html>",
+    "whitespace": "<html><body>\n\n<div>\n  <p>a   b</p>\n\n\n  <p>c</p>\n</div>\n</body></html>",
+    "no_title": "<html><body><p>no title</p></body></html>",
+    "empty_title": "<html><head><title></title></head><body><p>x</p></body></html>",
+    "fragment": "<p>just a fragment</p><p>two</p>",
+    "unclosed": "<html><body><div><p>open<p>para<li>item</div>end",
+    "xml_declaration": "<?xml version='1.0' encoding='utf-8'?><html><body><p>xhtml</p></body></html>",
+    "korean_news": ("<html><head><title>[속보] 코스피 상승</title></head><body><header>언론사</header>"
+                    "<article><h1>코스피, 외국인 매수에 2% 상승</h1><p>24일 코스피는 전 거래일 대비 2% 올랐다.</p>"
+                    "<p>반도체 업종이 강세를 보였다.</p></article><footer>Copyright</footer></body></html>"),
+    # bs4's get_text() leaves out <template> content and ruby annotations
+    "template_ruby": ("<html><body><p>a<template>hidden tmpl</template></p>"
+                      "<ruby>漢<rp>(</rp><rt>kan</rt><rp>)</rp></ruby></body></html>"),
+    "whitespace_only": "<html><body><p>x</p> \n <script>s</script>\t<p>y</p><textarea>  a\n  </textarea></body></html>",
+}
+
+
+@pytest.mark.parametrize("parser", [parser for parser in available_parsers() if parser != "bs4"])
+@pytest.mark.parametrize("name", sorted(GOLDEN_CORPUS))
+def test_backend_matches_bs4(parser, name):
+    """Every backend returns exactly the bs4 text and title (bs4 is the golden reference)."""
+    page = GOLDEN_CORPUS[name]
+    expected = HtmlConverter("bs4").convert_string(page)
+    result = HtmlConverter(parser).convert_string(page)
+    assert (result.markdown, result.title) == (expected.markdown, expected.title)